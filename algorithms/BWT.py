@@ -58,17 +58,18 @@ def entropy(S):
     P = P[P != 0]
     return -numpy.sum(P * numpy.log2(P))
 
-# Исходная строка
-S = "banana"
-print(f"Исходная строка: {S}\n")
+if __name__ == "__main__":
+    # Исходная строка
+    S = "banana"
+    print(f"Исходная строка: {S}\n")
 
-# Прямое преобразование BWT
-bwt_result, index = BWT(S)
-print(f"\nПрямое преобразование BWT: {bwt_result}, индекс: {index}")
+    # Прямое преобразование BWT
+    bwt_result, index = BWT(S)
+    print(f"\nПрямое преобразование BWT: {bwt_result}, индекс: {index}")
 
-# Обратное преобразование BWT
-original_string = better_iBWT(bwt_result, index)
-print(f"\nОбратное преобразование BWT: {original_string}")
+    # Обратное преобразование BWT
+    original_string = better_iBWT(bwt_result, index)
+    print(f"\nОбратное преобразование BWT: {original_string}")
 
-# Проверка, что мы вернулись к исходной строке
-assert original_string == S, "Ошибка: обратное преобразование BWT не совпадает с исходной строкой"
\ No newline at end of file
+    # Проверка, что мы вернулись к исходной строке
+    assert original_string == S, "Ошибка: обратное преобразование BWT не совпадает с исходной строкой"
\ No newline at end of file
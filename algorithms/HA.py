@@ -127,9 +127,10 @@ def HA(S):
 def string_binary_to_int(s):
     return int(s, 2)
 
-# Пример использования
-S = "abracadabra"
-print("алгоритм HA")
-print(f"Исходная строка: '{S}'")
-encoded_data, codes = HA(S)
-print("\nЗакодированные данные (в байтах):", encoded_data)
\ No newline at end of file
+if __name__ == "__main__":
+    # Пример использования
+    S = "abracadabra"
+    print("алгоритм HA")
+    print(f"Исходная строка: '{S}'")
+    encoded_data, codes = HA(S)
+    print("\nЗакодированные данные (в байтах):", encoded_data)
\ No newline at end of file
@@ -42,10 +42,11 @@ def lz77_compress(data, search_buffer_size=1024, look_ahead_buffer_size=256):
     return compressed_data
 
 
-# Пример использования с русскоязычным выводом
-print("алгоритм LZ77")
-data = "abracadabra"
-print(f"Исходные данные: '{data}'")
-print("\nПроцесс сжатия:")
-compressed = lz77_compress(data)
-print("\nИтоговые сжатые данные:", compressed)
\ No newline at end of file
+if __name__ == "__main__":
+    # Пример использования с русскоязычным выводом
+    print("алгоритм LZ77")
+    data = "abracadabra"
+    print(f"Исходные данные: '{data}'")
+    print("\nПроцесс сжатия:")
+    compressed = lz77_compress(data)
+    print("\nИтоговые сжатые данные:", compressed)
\ No newline at end of file
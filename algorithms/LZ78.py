@@ -35,14 +35,6 @@ def lz78_decompress(compressed_data):
 
     return decompressed_string
 
-# Пример использования
-input_string = "abacabacabadaca"
-compressed, dictionary = lz78_compress(input_string)
-print("Сжатые данные:", compressed)
-print("Словарь:", dictionary)
-
-decompressed_string = lz78_decompress(compressed)
-print("Распакованная строка:", decompressed_string)
 def lz78_compress_with_logs(input_string):
     dictionary = {}
     current_string = ""
@@ -71,11 +63,21 @@ def lz78_compress_with_logs(input_string):
 
     return output, dictionary
 
-# Пример использования с логами
-input_string = "abacabacabadaca"
-compressed, dictionary = lz78_compress_with_logs(input_string)
-print("Сжатые данные:", compressed)
-print("Словарь:", dictionary)
+if __name__ == "__main__":
+    # Пример использования
+    input_string = "abacabacabadaca"
+    compressed, dictionary = lz78_compress(input_string)
+    print("Сжатые данные:", compressed)
+    print("Словарь:", dictionary)
+
+    decompressed_string = lz78_decompress(compressed)
+    print("Распакованная строка:", decompressed_string)
+
+    # Пример использования с логами
+    input_string = "abacabacabadaca"
+    compressed, dictionary = lz78_compress_with_logs(input_string)
+    print("Сжатые данные:", compressed)
+    print("Словарь:", dictionary)
 
-decompressed_string = lz78_decompress(compressed)
-print("Распакованная строка:", decompressed_string)
\ No newline at end of file
+    decompressed_string = lz78_decompress(compressed)
+    print("Распакованная строка:", decompressed_string)
\ No newline at end of file
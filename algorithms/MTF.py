@@ -55,14 +55,15 @@ def mtf_decode(encoded_list):
     return decoded_string
 
 
-# Пример использования
-input_string = "banana"
-print("Исходная строка:", input_string)
-
-# Кодирование
-print("\n=== Кодирование ===")
-encoded = mtf_encode(input_string)
-
-# Декодирование
-print("\n=== Декодирование ===")
-decoded_string = mtf_decode(encoded)
\ No newline at end of file
+if __name__ == "__main__":
+    # Пример использования
+    input_string = "banana"
+    print("Исходная строка:", input_string)
+
+    # Кодирование
+    print("\n=== Кодирование ===")
+    encoded = mtf_encode(input_string)
+
+    # Декодирование
+    print("\n=== Декодирование ===")
+    decoded_string = mtf_decode(encoded)
\ No newline at end of file
@@ -31,12 +31,13 @@ def rle_decode(encoded):
         print(f"Декодируем пару: ('{char}', {count}). Результат: '{decoded}'")
     return decoded
 
-# Пример использования
-data = "AAAABBBCCDAA"
-print(f"Исходные данные: '{data}'")
+if __name__ == "__main__":
+    # Пример использования
+    data = "AAAABBBCCDAA"
+    print(f"Исходные данные: '{data}'")
 
-encoded = rle_encode(data)
-print(f"Закодированные данные: {encoded}")
+    encoded = rle_encode(data)
+    print(f"Закодированные данные: {encoded}")
 
-decoded = rle_decode(encoded)
-print(f"Декодированные данные: '{decoded}'")
\ No newline at end of file
+    decoded = rle_decode(encoded)
+    print(f"Декодированные данные: '{decoded}'")
\ No newline at end of file
@@ -0,0 +1,8 @@
+"""
+Алгоритмы сжатия без побочных эффектов при импорте.
+
+Стадии: bwt, mtf, rle, huffman, lz77, lz78; вспомогательные модули: varint,
+image (заголовок raw-изображений и фильтрация строк), metrics.
+Модуль pipeline собирает стадии в конвейеры по описанию (реестр STAGES, класс Pipeline).
+Сценарии "comp *.py" в этом каталоге - драйверы, собирающие из стадий конвейеры.
+"""
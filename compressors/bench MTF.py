@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+
+# Каталоги относительно расположения скрипта
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+FILES_DIR = os.path.join(SCRIPT_DIR, "..", "files to compress")
+
+# Сценарий запускается напрямую: пакет compressors импортируется из корня репозитория
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+from compressors.bwt import bwt_transform
+from compressors.mtf import mtf_inverse, mtf_transform
+
+# Размер блока, на котором измеряется скорость (как в конвейере BWT+MTF+HA)
+BENCH_BLOCK_SIZE = 200 * 1024
+
+
+# Исходная реализация MTF (список из 256 элементов, index + pop + insert на каждый байт)
+def mtf_transform_baseline(data: bytes) -> bytes:
+    alphabet = list(range(256))
+    transformed_data = bytearray()
+    for byte in data:
+        index = alphabet.index(byte)
+        transformed_data.append(index)
+        alphabet.pop(index)
+        alphabet.insert(0, byte)
+    return bytes(transformed_data)
+
+
+def mtf_inverse_baseline(transformed_data: bytes) -> bytes:
+    alphabet = list(range(256))
+    original_data = bytearray()
+    for index in transformed_data:
+        byte = alphabet[index]
+        original_data.append(byte)
+        alphabet.pop(index)
+        alphabet.insert(0, byte)
+    return bytes(original_data)
+
+
+# Скорость функции в МБ/с
+def measure(func, data):
+    start_time = time.perf_counter()
+    result = func(data)
+    elapsed_time = time.perf_counter() - start_time
+    return result, len(data) / (1024 * 1024) / elapsed_time
+
+
+def bench_file(file_path):
+    with open(file_path, "rb") as f:
+        block = f.read(BENCH_BLOCK_SIZE)
+
+    # MTF работает на выходе BWT, поэтому измеряем на преобразованном блоке
+    transformed_block, _ = bwt_transform(block)
+
+    baseline_ranks, baseline_encode = measure(mtf_transform_baseline, transformed_block)
+    ranks, encode = measure(mtf_transform, transformed_block)
+    if ranks != baseline_ranks:
+        raise ValueError("Результаты прямого MTF не совпадают")
+
+    baseline_restored, baseline_decode = measure(mtf_inverse_baseline, ranks)
+    restored, decode = measure(mtf_inverse, ranks)
+    if restored != transformed_block or baseline_restored != transformed_block:
+        raise ValueError("Результаты обратного MTF не совпадают")
+
+    print(f"Файл {os.path.basename(file_path)} ({len(block)} байт):")
+    print(f"  Прямое MTF: {baseline_encode:.2f} -> {encode:.2f} МБ/с (x{encode / baseline_encode:.1f})")
+    print(f"  Обратное MTF: {baseline_decode:.2f} -> {decode:.2f} МБ/с (x{decode / baseline_decode:.1f})")
+
+
+# Список файлов для обработки
+file_names = [
+    "text.txt",
+    "binary_file.bin",
+    "bw_image.raw",
+    "gray_image.raw",
+    "color_image.raw"
+]
+
+# Обработка каждого файла
+if __name__ == "__main__":
+    for file_name in file_names:
+        bench_file(os.path.join(FILES_DIR, file_name))
@@ -0,0 +1,86 @@
+import itertools
+import os
+import sys
+import time
+
+# Каталоги относительно расположения скрипта
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+FILES_DIR = os.path.join(SCRIPT_DIR, "..", "files to compress")
+
+# Сценарий запускается напрямую: пакет compressors импортируется из корня репозитория
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+from compressors.image import RAW_IMAGE_CHANNELS, parse_raw_header
+from compressors.pipeline import Pipeline
+
+# Размер фрагмента файла, на котором сравниваются конвейеры. Raw-изображение обрезается
+# до целого числа строк, чтобы стадии изображений (prefilter, RLE по битам) работали на нём
+BENCH_BLOCK_SIZE = 200 * 1024
+
+# Варианты стадий по позициям конвейера: проверяются все сочетания.
+# Новая стадия, зарегистрированная в STAGES, добавляется в подходящий список
+PREPROCESSING = [[], ["prefilter"]]
+TRANSFORMS = [[], ["bwt"], ["bwt", "mtf"], ["bwt", "mtf", "zrle"], ["lz77"], ["lz78"]]
+CODERS = [[], ["rle"], ["rle7"], ["huffman"]]
+
+
+def pipeline_specs():
+    for stages in itertools.product(PREPROCESSING, TRANSFORMS, CODERS):
+        spec = [stage for part in stages for stage in part]
+        if spec:
+            yield spec
+
+
+# Фрагмент файла для измерений: у raw-изображения - первые строки с исправленным заголовком
+def read_sample(file_path):
+    with open(file_path, "rb") as f:
+        data = f.read()
+    raw_header = parse_raw_header(data)
+    if raw_header is None:
+        return data[:BENCH_BLOCK_SIZE]
+    kind, width, height, offset = raw_header
+    row_size = width * RAW_IMAGE_CHANNELS[kind]
+    rows = min(height, max(1, BENCH_BLOCK_SIZE // row_size))
+    return f"{kind},{width},{rows}\n".encode("ascii") + data[offset:offset + rows * row_size]
+
+
+# Скорость функции в МБ/с
+def measure(func, data, size):
+    start_time = time.perf_counter()
+    result = func(data)
+    elapsed_time = time.perf_counter() - start_time
+    return result, size / (1024 * 1024) / elapsed_time
+
+
+def bench_file(file_path, pipelines):
+    block = read_sample(file_path)
+
+    results = []
+    for pipeline in pipelines:
+        encoded, encode = measure(pipeline.encode, block, len(block))
+        decoded, decode = measure(pipeline.decode, encoded, len(block))
+        if decoded != block:
+            raise ValueError(f"Конвейер {pipeline.name} не восстановил данные")
+        results.append((len(encoded), pipeline.name, encode, decode))
+
+    print(f"Файл {os.path.basename(file_path)} ({len(block)} байт):")
+    for compressed_size, name, encode, decode in sorted(results):
+        ratio = len(block) / compressed_size if compressed_size > 0 else 0
+        print(f"  {name:32} {compressed_size:8} байт, x{ratio:7.2f}, сжатие {encode:7.2f} МБ/с, "
+              f"распаковка {decode:7.2f} МБ/с")
+
+
+# Список файлов для обработки
+file_names = [
+    "text.txt",
+    "binary_file.bin",
+    "bw_image.raw",
+    "gray_image.raw",
+    "color_image.raw"
+]
+
+# Обработка каждого файла
+if __name__ == "__main__":
+    pipelines = [Pipeline(spec) for spec in pipeline_specs()]
+    for file_name in file_names:
+        bench_file(os.path.join(FILES_DIR, file_name), pipelines)
@@ -0,0 +1,174 @@
+"""
+Преобразование Барроуза-Уилера: прямое через суффиксный массив, обратное через LF-отображение.
+"""
+import numpy as np
+
+# Размер чанка BWT: 0 - преобразование всего блока целиком, один индекс на блок
+BWT_CHUNK_SIZE = 0
+# Число дополнительных выборок строк на чанк для параллельного обратного BWT (0 - без выборок).
+# Допустимы 0 или значения от SAMPLED_INVERSE_MIN_SAMPLES (рекомендуется 31-63)
+BWT_SAMPLES = 0
+# Наименьшее число выборок. Шаг векторного прохода по всем цепочкам стоит около 1 мкс,
+# шаг простого прохода - 85-175 нс на байт, поэтому цепочек нужно несколько десятков:
+# при 15 выборках обратное BWT изображений блоками 4 МБ не ускоряется, при 31 выборке
+# на всех файлах оно быстрее простого прохода в 1.4-2.4 раза (блоки 4 МБ)
+SAMPLED_INVERSE_MIN_SAMPLES = 31
+# Наименьшая длина отрезка одной цепочки: для чанков короче (samples + 1) цепочек такой
+# длины векторный проход не окупается, и выборки для них не записываются
+SAMPLED_INVERSE_MIN_CHAIN_LENGTH = 32
+
+
+def bwt_transform(data: bytes, chunk_size: int = BWT_CHUNK_SIZE,
+                  samples: int = BWT_SAMPLES) -> tuple[bytes, list[int]]:
+    """
+    Применяет преобразование Барроуза-Уилера к данным с разбиением на чанки.
+    """
+    validate_samples(samples)
+    if chunk_size == 0:
+        chunk_size = max(len(data), 1)
+    transformed_data = bytearray()
+    indices = []
+    for start in range(0, len(data), chunk_size):
+        chunk = data[start:start + chunk_size]
+        index, encoded_chunk, sample_rows = transform_chunk(chunk, chunk_samples(len(chunk), samples))
+        transformed_data.extend(encoded_chunk)
+        indices.append(index)
+        indices.extend(sample_rows)
+    return bytes(transformed_data), indices
+
+
+def validate_samples(samples: int):
+    """
+    Проверяет число выборок на чанк: 0 или не меньше SAMPLED_INVERSE_MIN_SAMPLES.
+    """
+    if samples < 0:
+        raise ValueError("Число выборок BWT не может быть отрицательным")
+    if 0 < samples < SAMPLED_INVERSE_MIN_SAMPLES:
+        raise ValueError(f"Число выборок BWT должно быть 0 или не меньше {SAMPLED_INVERSE_MIN_SAMPLES}")
+
+
+def chunk_samples(chunk_length: int, samples: int) -> int:
+    """
+    Число выборок, записываемых для чанка длины chunk_length: samples, если каждая
+    из samples + 1 цепочек не короче SAMPLED_INVERSE_MIN_CHAIN_LENGTH, иначе 0.
+    """
+    if chunk_length < (samples + 1) * SAMPLED_INVERSE_MIN_CHAIN_LENGTH:
+        return 0
+    return samples
+
+
+def cyclic_suffix_array(chunk: bytes) -> np.ndarray:
+    """
+    Строит суффиксный массив циклических сдвигов чанка методом удвоения префиксов на NumPy.
+    Сами сдвиги не материализуются. Каждый раунд - одна устойчивая сортировка, раундов не
+    больше log N: O(N log^2 N) времени в худшем случае. Ранги и порядок хранятся в int32,
+    пиковая память - около 25 байт на байт чанка (около 200 МБ для блока 8 МБ).
+    """
+    n = len(chunk)
+    rank = np.frombuffer(chunk, dtype=np.uint8).astype(np.int32)
+    order = np.argsort(rank, kind='stable').astype(np.int32)
+    classes = int(np.count_nonzero(np.bincount(rank, minlength=256)))
+    k = 1
+    while classes < n and k < n:
+        # Сдвиги, упорядоченные по рангу следующих k байт, получаются из прошлого порядка;
+        # устойчивая сортировка по рангу первых k байт даёт порядок по паре рангов
+        second = order - k
+        second[second < 0] += n
+        order = second[np.argsort(rank[second], kind='stable')]
+        del second
+        # Новый класс начинается там, где меняется первый или второй ранг пары
+        boundary = np.diff(rank[order]) != 0
+        shifted = order + k
+        shifted[shifted >= n] -= n
+        boundary |= np.diff(rank[shifted]) != 0
+        del shifted
+        rank = np.empty(n, dtype=np.int32)
+        rank[order[0]] = 0
+        rank[order[1:]] = np.cumsum(boundary, dtype=np.int32)
+        del boundary
+        new_classes = int(rank[order[-1]]) + 1
+        # Разбиение не изменилось - оставшиеся равные сдвиги идентичны (периодичные данные)
+        if new_classes == classes:
+            break
+        classes = new_classes
+        k *= 2
+    return order
+
+
+def transform_chunk(chunk: bytes, samples: int = 0) -> tuple[int, bytes, list[int]]:
+    """
+    Преобразует один чанк данных с помощью BWT через суффиксный массив.
+    """
+    order = cyclic_suffix_array(chunk)
+    encoded_chunk = np.frombuffer(chunk, dtype=np.uint8)[order - 1].tobytes()
+    # Номер строки матрицы для каждого сдвига: индекс исходной строки и строки равноотстоящих выборок
+    rows = np.empty(len(chunk), dtype=np.int32)
+    rows[order] = np.arange(len(chunk), dtype=np.int32)
+    original_index = int(rows[0])
+    sample_rows = [int(rows[j * len(chunk) // (samples + 1)]) for j in range(1, samples + 1)]
+    return original_index, encoded_chunk, sample_rows
+
+
+def bwt_inverse(transformed_data: bytes, indices: list[int], chunk_size: int = BWT_CHUNK_SIZE,
+                samples: int = BWT_SAMPLES) -> bytes:
+    """
+    Обратное преобразование Барроуза-Уилера с разбиением на чанки.
+    """
+    if chunk_size == 0:
+        chunk_size = max(len(transformed_data), 1)
+    restored_data = bytearray()
+    position = 0
+    index = 0
+    while position < len(transformed_data):
+        end = position + chunk_size if position + chunk_size <= len(transformed_data) else len(transformed_data)
+        chunk = transformed_data[position:end]
+        original_index = indices[index]
+        count = chunk_samples(len(chunk), samples)
+        sample_rows = indices[index + 1:index + 1 + count]
+        restored_chunk = reverse_transform_chunk(original_index, chunk, sample_rows)
+        restored_data.extend(restored_chunk)
+        position = end
+        index += 1 + count
+    return bytes(restored_data)
+
+
+def reverse_transform_chunk(original_index: int, encoded_chunk: bytes, sample_rows: list[int] | None = None) -> bytes:
+    """
+    Обратное преобразование BWT для одного чанка через LF-отображение на NumPy.
+    """
+    last_column = np.frombuffer(encoded_chunk, dtype=np.uint8)
+    # Первый столбец восстанавливается подсчётом символов по всем 256 значениям
+    counts = np.bincount(last_column, minlength=256)
+    first_column = np.repeat(np.arange(256, dtype=np.uint8), counts)
+    # T-вектор: устойчивая сортировка подсчётом (для uint8 NumPy использует поразрядную сортировку)
+    next_rows = np.argsort(last_column, kind='stable').astype(np.int32)
+    if sample_rows:
+        return reverse_transform_sampled(first_column, next_rows, [original_index, *sample_rows])
+    next_rows = memoryview(next_rows)
+    # Единственная неустранимо последовательная часть - проход по цепочке строк
+    rows = np.empty(len(last_column), dtype=np.int32)
+    rows_view = memoryview(rows)
+    current_row = original_index
+    for i in range(len(rows)):
+        rows_view[i] = current_row
+        current_row = next_rows[current_row]
+    return first_column[rows].tobytes()
+
+
+def reverse_transform_sampled(first_column: np.ndarray, next_rows: np.ndarray, start_rows: list[int]) -> bytes:
+    """
+    Обратное BWT по нескольким независимым цепочкам: каждая выборка начинает свой
+    отрезок исходных данных, и все цепочки продвигаются одновременно векторными операциями.
+    """
+    n = len(first_column)
+    chains = len(start_rows)
+    lengths = np.diff([j * n // chains for j in range(chains + 1)])
+    steps = int(lengths.max())
+    rows = np.empty((steps, chains), dtype=np.int32)
+    current_rows = np.array(start_rows, dtype=np.int32)
+    for step in range(steps):
+        rows[step] = current_rows
+        current_rows = next_rows[current_rows]
+    # Отбрасываем лишний шаг у более коротких отрезков и склеиваем их по порядку
+    valid = np.arange(steps)[:, None] < lengths
+    return first_column[rows.T[valid.T]].tobytes()
@@ -1,238 +1,50 @@
-import numpy as np
-import heapq
-import time
-import math
 import os
-from collections import defaultdict
+import sys
+import time
+
+# Сценарий запускается напрямую: пакет compressors импортируется из корня репозитория
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compressors.bwt import BWT_CHUNK_SIZE, BWT_SAMPLES, bwt_inverse, bwt_transform, validate_samples
+from compressors.huffman import huffman_decode_symbols, huffman_encode_symbols
+from compressors.mtf import ZERO_RUN_ALPHABET_SIZE, mtf_inverse, mtf_transform, zero_run_decode, zero_run_encode
+from compressors.rle import rle7_compress, rle7_decompress
 
 # Размер блока (200 КБ)
 BLOCK_SIZE = 200 * 1024
 
+# Максимальный размер блока (8 МБ)
+MAX_BLOCK_SIZE = 8 * 1024 * 1024
 
-# Класс для узлов дерева Хаффмана
-class HuffmanNode:
-    def __init__(self, char=None, freq=0, left=None, right=None):
-        self.char = char
-        self.freq = freq
-        self.left = left
-        self.right = right
-
-    def __lt__(self, other):
-        return self.freq < other.freq
-
-
-# Функции для BWT
-def bwt_transform(data: bytes, chunk_size: int = 1024) -> tuple[bytes, list[int]]:
-    transformed_data = bytearray()
-    indices = []
-    for start in range(0, len(data), chunk_size):
-        chunk = data[start:start + chunk_size]
-        index, encoded_chunk = transform_chunk(chunk)
-        transformed_data.extend(encoded_chunk)
-        indices.append(index)
-    return bytes(transformed_data), indices
-
-
-def transform_chunk(chunk: bytes) -> tuple[int, bytes]:
-    rotations = [chunk[i:] + chunk[:i] for i in range(len(chunk))]
-    rotations.sort()
-    original_index = rotations.index(chunk)
-    encoded_chunk = bytes(rotation[-1] for rotation in rotations)
-    return original_index, encoded_chunk
-
-
-def bwt_inverse(transformed_data: bytes, indices: list[int], chunk_size: int = 1024) -> bytes:
-    restored_data = bytearray()
-    position = 0
-    index = 0
-    while position < len(transformed_data):
-        end = position + chunk_size if position + chunk_size <= len(transformed_data) else len(transformed_data)
-        chunk = transformed_data[position:end]
-        original_index = indices[index]
-        restored_chunk = reverse_transform_chunk(original_index, chunk)
-        restored_data.extend(restored_chunk)
-        position = end
-        index += 1
-    return bytes(restored_data)
-
-
-def reverse_transform_chunk(original_index: int, encoded_chunk: bytes) -> bytes:
-    table = [(char, idx) for idx, char in enumerate(encoded_chunk)]
-    table.sort()
-    result = bytearray()
-    current_row = original_index
-    for _ in range(len(encoded_chunk)):
-        char, current_row = table[current_row]
-        result.append(char)
-    return bytes(result)
-
-
-# Функции для MTF
-def mtf_transform(data: bytes) -> bytes:
-    alphabet = list(range(256))
-    transformed_data = bytearray()
-    for byte in data:
-        index = alphabet.index(byte)
-        transformed_data.append(index)
-        alphabet.pop(index)
-        alphabet.insert(0, byte)
-    return bytes(transformed_data)
-
-
-def mtf_inverse(transformed_data: bytes) -> bytes:
-    alphabet = list(range(256))
-    original_data = bytearray()
-    for index in transformed_data:
-        byte = alphabet[index]
-        original_data.append(byte)
-        alphabet.pop(index)
-        alphabet.insert(0, byte)
-    return bytes(original_data)
-
-
-# Функции для RLE с битовыми флагами
-def rle_compress(data: bytes) -> bytes:
-    compressed = bytearray()
-    i = 0
-    n = len(data)
-    while i < n:
-        current = data[i]
-        count = 1
-        while i + count < n and count < 127 and data[i + count] == current:
-            count += 1
-        if count > 1:
-            compressed.append(0x80 | count)
-            compressed.append(current)
-            i += count
-        else:
-            seq = bytearray()
-            seq.append(current)
-            i += 1
-            while i < n and len(seq) < 127 and (i >= n - 1 or data[i] != data[i + 1]):
-                seq.append(data[i])
-                i += 1
-            compressed.append(len(seq))
-            compressed.extend(seq)
-    return bytes(compressed)
-
-
-def rle_decompress(compressed_data: bytes) -> bytes:
-    decompressed = bytearray()
-    i = 0
-    n = len(compressed_data)
-    while i < n:
-        header = compressed_data[i]
-        i += 1
-
-        if header & 0x80:
-            count = header & 0x7F
-            if i >= n:
-                raise ValueError("Invalid RLE data")
-            byte = compressed_data[i]
-            i += 1
-            decompressed.extend([byte] * count)
-        else:
-            length = header
-            if i + length > n:
-                raise ValueError("Invalid RLE data")
-            decompressed.extend(compressed_data[i:i + length])
-            i += length
-    return bytes(decompressed)
-
-
-# Функции для Хаффмана
-def build_huffman_tree(freq_dict):
-    heap = []
-    for char, freq in freq_dict.items():
-        heapq.heappush(heap, HuffmanNode(char=char, freq=freq))
-
-    while len(heap) > 1:
-        left = heapq.heappop(heap)
-        right = heapq.heappop(heap)
-        merged = HuffmanNode(freq=left.freq + right.freq, left=left, right=right)
-        heapq.heappush(heap, merged)
-
-    return heapq.heappop(heap)
-
-
-def build_huffman_codes(node, current_code="", codes=None):
-    if codes is None:
-        codes = {}
-    if node.char is not None:
-        codes[node.char] = current_code
-    else:
-        build_huffman_codes(node.left, current_code + "0", codes)
-        build_huffman_codes(node.right, current_code + "1", codes)
-    return codes
-
-def huffman_compress(data: bytes) -> tuple[bytes, dict]:
-    freq_dict = defaultdict(int)
-    for byte in data:
-        freq_dict[byte] += 1
-
-    if len(freq_dict) == 0:
-        return bytes(), {}
-
-    root = build_huffman_tree(freq_dict)
-    codes = build_huffman_codes(root)
-
-    encoded_bits = []
-    for byte in data:
-        encoded_bits.append(codes[byte])
-
-    bit_string = ''.join(encoded_bits)
-    padding = 8 - len(bit_string) % 8
-    bit_string += '0' * padding
-
-    compressed = bytearray()
-    compressed.append(padding)
-
-    for i in range(0, len(bit_string), 8):
-        byte = bit_string[i:i + 8]
-        compressed.append(int(byte, 2))
-
-    return bytes(compressed), codes
-
-
-def huffman_decompress(compressed_data: bytes, huffman_codes: dict) -> bytes:
-    if len(compressed_data) == 0:
-        return bytes()
-
-    padding = compressed_data[0]
-    bit_string = ''.join(f"{byte:08b}" for byte in compressed_data[1:])
-    if padding > 0:
-        bit_string = bit_string[:-padding]
-
-    reverse_codes = {v: k for k, v in huffman_codes.items()}
-    current_code = ""
-    decompressed = bytearray()
-
-    for bit in bit_string:
-        current_code += bit
-        if current_code in reverse_codes:
-            decompressed.append(reverse_codes[current_code])
-            current_code = ""
-
-    return bytes(decompressed)
 
-
-def process_block(block: bytes) -> tuple[bytes, list[int], dict, float, float]:
+def process_block(block: bytes, chunk_size: int = BWT_CHUNK_SIZE,
+                  samples: int = BWT_SAMPLES) -> tuple[bytes, list[int]]:
     # BWT
-    transformed_data, indices = bwt_transform(block)
+    transformed_data, indices = bwt_transform(block, chunk_size, samples)
+
+    # RLE
+    transformed_data = rle7_compress(transformed_data)
 
     # MTF
     transformed_data = mtf_transform(transformed_data)
 
-    # RLE
-    transformed_data = rle_compress(transformed_data)
+    # Серии нулевых рангов (RUNA/RUNB)
+    symbols = zero_run_encode(transformed_data)
 
     # Huffman
-    compressed_data, codes = huffman_compress(transformed_data)
+    compressed_data, _ = huffman_encode_symbols(symbols, ZERO_RUN_ALPHABET_SIZE)
 
-    return compressed_data, indices, codes
+    return compressed_data, indices
 
 
-def compress_file(file_path, output_compressed):
+def compress_file(file_path, output_compressed, block_size=BLOCK_SIZE, chunk_size=BWT_CHUNK_SIZE,
+                  samples=BWT_SAMPLES):
+    if not 0 < block_size <= MAX_BLOCK_SIZE:
+        raise ValueError(f"Размер блока должен быть от 1 до {MAX_BLOCK_SIZE} байт")
+    if chunk_size < 0:
+        raise ValueError("Размер чанка BWT не может быть отрицательным")
+    validate_samples(samples)
+
     start_time = time.time()
 
     with open(file_path, "rb") as f:
@@ -249,22 +61,20 @@ def compress_file(file_path, output_compressed):
         with open(file_path, "rb") as f:
             block_number = 0
             while True:
-                block = f.read(BLOCK_SIZE)
+                block = f.read(block_size)
                 if not block:
                     break
 
-                compressed_block, indices, codes = process_block(block)
+                compressed_block, indices = process_block(block, chunk_size, samples)
                 block_count += 1
 
                 compressed_file.write(block_number.to_bytes(4, 'big'))
+                compressed_file.write(chunk_size.to_bytes(4, 'big'))
+                compressed_file.write(samples.to_bytes(4, 'big'))
                 compressed_file.write(len(indices).to_bytes(4, 'big'))
                 for index in indices:
                     compressed_file.write(index.to_bytes(4, 'big'))
 
-                code_bytes = serialize_huffman_codes(codes)
-                compressed_file.write(len(code_bytes).to_bytes(4, 'big'))
-                compressed_file.write(code_bytes)
-
                 compressed_file.write(len(compressed_block).to_bytes(4, 'big'))
                 compressed_file.write(compressed_block)
                 block_number += 1
@@ -290,27 +100,28 @@ def decompress_file(input_compressed, output_decompressed):
                 break
 
             block_number = int.from_bytes(block_number_bytes, 'big')
+            chunk_size = int.from_bytes(f.read(4), 'big')
+            samples = int.from_bytes(f.read(4), 'big')
             num_indices = int.from_bytes(f.read(4), 'big')
             indices = [int.from_bytes(f.read(4), 'big') for _ in range(num_indices)]
 
-            code_size = int.from_bytes(f.read(4), 'big')
-            code_bytes = f.read(code_size)
-            codes = deserialize_huffman_codes(code_bytes)
-
             block_size = int.from_bytes(f.read(4), 'big')
             compressed_block = f.read(block_size)
 
             # Huffman декомпрессия
-            decompressed_transformed = huffman_decompress(compressed_block, codes)
+            symbols = huffman_decode_symbols(compressed_block, ZERO_RUN_ALPHABET_SIZE)
 
-            # RLE декомпрессия
-            decompressed_transformed = rle_decompress(decompressed_transformed)
+            # Восстановление серий нулевых рангов
+            decompressed_transformed = zero_run_decode(symbols)
 
             # MTF декомпрессия
             decompressed_transformed = mtf_inverse(decompressed_transformed)
 
+            # RLE декомпрессия
+            decompressed_transformed = rle7_decompress(decompressed_transformed)
+
             # BWT декомпрессия
-            decompressed_data = bwt_inverse(decompressed_transformed, indices)
+            decompressed_data = bwt_inverse(decompressed_transformed, indices, chunk_size, samples)
             blocks[block_number] = decompressed_data
 
     with open(output_decompressed, "wb") as decompressed_file:
@@ -321,32 +132,6 @@ def decompress_file(input_compressed, output_decompressed):
     print(f"Размер после декомпрессии: {decompressed_size} байт\n")
 
 
-def serialize_huffman_codes(codes):
-    serialized = bytearray()
-    for char, code in codes.items():
-        serialized.extend([char, len(code)])
-        code_bytes = int(code, 2).to_bytes((len(code) + 7) // 8, 'big')
-        serialized.append(len(code_bytes))
-        serialized.extend(code_bytes)
-    return bytes(serialized)
-
-
-def deserialize_huffman_codes(code_bytes):
-    codes = {}
-    i = 0
-    while i < len(code_bytes):
-        char = code_bytes[i]
-        code_len = code_bytes[i + 1]
-        bytes_len = code_bytes[i + 2]
-        i += 3
-
-        code_int = int.from_bytes(code_bytes[i:i + bytes_len], 'big')
-        code = bin(code_int)[2:].zfill(code_len)
-        codes[char] = code
-        i += bytes_len
-    return codes
-
-
 # Список файлов для обработки
 file_paths = [
     "C:/Users/79508/Desktop/4 семестри/АИСД/1 лабораторная/коди/буквы и картинки/text.txt",
@@ -358,12 +143,13 @@ file_paths = [
 ]
 
 # Обработка каждого файла
-for i, file_path in enumerate(file_paths):
-    output_compressed = f"compressed_BWT+RLE+MTF+HA_{i + 1}.bin"
-    output_decompressed = f"decompressed_BWT+RLE+MTF+HA_{i + 1}.bin"
+if __name__ == "__main__":
+    for i, file_path in enumerate(file_paths):
+        output_compressed = f"compressed_BWT+RLE+MTF+HA_{i + 1}.bin"
+        output_decompressed = f"decompressed_BWT+RLE+MTF+HA_{i + 1}.bin"
 
-    # Сжатие
-    compress_file(file_path, output_compressed)
+        # Сжатие
+        compress_file(file_path, output_compressed)
 
-    # Распаковка
-    decompress_file(output_compressed, output_decompressed)
\ No newline at end of file
+        # Распаковка
+        decompress_file(output_compressed, output_decompressed)
@@ -1,122 +1,37 @@
-import time
-import math
 import os
+import sys
+import time
+
+# Сценарий запускается напрямую: пакет compressors импортируется из корня репозитория
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compressors.bwt import BWT_CHUNK_SIZE, BWT_SAMPLES, bwt_inverse, bwt_transform, validate_samples
+from compressors.rle import rle7_compress, rle7_decompress
 
 # Размер блока (64 КБ)
 BLOCK_SIZE = 64 * 1024
 
-def bwt_transform(data: bytes, chunk_size: int = 1024) -> tuple[bytes, list[int]]:
-    """
-    Применяет преобразование Барроуза-Уилера к данным с разбиением на чанки.
-    """
-    transformed_data = bytearray()
-    indices = []
-    for start in range(0, len(data), chunk_size):
-        chunk = data[start:start + chunk_size]
-        index, encoded_chunk = transform_chunk(chunk)
-        transformed_data.extend(encoded_chunk)
-        indices.append(index)
-    return bytes(transformed_data), indices
-
-def transform_chunk(chunk: bytes) -> tuple[int, bytes]:
-    """
-    Преобразует один чанк данных с помощью BWT.
-    """
-    rotations = [chunk[i:] + chunk[:i] for i in range(len(chunk))]
-    rotations.sort()
-    original_index = rotations.index(chunk)
-    encoded_chunk = bytes(rotation[-1] for rotation in rotations)
-    return original_index, encoded_chunk
+# Максимальный размер блока (8 МБ)
+MAX_BLOCK_SIZE = 8 * 1024 * 1024
 
-def bwt_inverse(transformed_data: bytes, indices: list[int], chunk_size: int = 1024) -> bytes:
-    """
-    Обратное преобразование Барроуза-Уилера с разбиением на чанки.
-    """
-    restored_data = bytearray()
-    position = 0
-    index = 0
-    while position < len(transformed_data):
-        end = position + chunk_size if position + chunk_size <= len(transformed_data) else len(transformed_data)
-        chunk = transformed_data[position:end]
-        original_index = indices[index]
-        restored_chunk = reverse_transform_chunk(original_index, chunk)
-        restored_data.extend(restored_chunk)
-        position = end
-        index += 1
-    return bytes(restored_data)
-
-def reverse_transform_chunk(original_index: int, encoded_chunk: bytes) -> bytes:
-    """
-    Обратное преобразование BWT для одного чанка.
-    """
-    table = [(char, idx) for idx, char in enumerate(encoded_chunk)]
-    table.sort()
-    result = bytearray()
-    current_row = original_index
-    for _ in range(len(encoded_chunk)):
-        char, current_row = table[current_row]
-        result.append(char)
-    return bytes(result)
-
-def rle_compress(data: bytes) -> bytes:
-    compressed = bytearray()
-    i = 0
-    n = len(data)
-    while i < n:
-        current = data[i]
-        count = 1
-        while i + count < n and count < 127 and data[i + count] == current:
-            count += 1
-        if count > 1:
-            compressed.append(0x80 | count)  # Бит 7 = 1 для повторов
-            compressed.append(current)
-            i += count
-        else:
-            # Собираем неповторяющуюся последовательность
-            seq = bytearray()
-            seq.append(current)
-            i += 1
-            while i < n and len(seq) < 127 and (i >= n-1 or data[i] != data[i+1]):
-                seq.append(data[i])
-                i += 1
-            compressed.append(len(seq))  # Бит 7 = 0
-            compressed.extend(seq)
-    return bytes(compressed)
-
-
-def rle_decompress(compressed_data: bytes) -> bytes:
-    decompressed = bytearray()
-    i = 0
-    n = len(compressed_data)
-    while i < n:
-        header = compressed_data[i]
-        i += 1
-
-        if header & 0x80:  # Если установлен бит 7 - это повтор
-            count = header & 0x7F  # Получаем длину (биты 0-6)
-            if i >= n:
-                raise ValueError("Invalid RLE data: missing byte after repeat header")
-            byte = compressed_data[i]
-            i += 1
-            decompressed.extend([byte] * count)
-        else:  # Это последовательность неповторяющихся символов
-            length = header
-            if i + length > n:
-                raise ValueError(f"Invalid RLE data: expected {length} bytes, got {n - i}")
-            decompressed.extend(compressed_data[i:i + length])
-            i += length
-    return bytes(decompressed)
-
-def process_block(block: bytes) -> tuple[bytes, list[int]]:
+def process_block(block: bytes, chunk_size: int = BWT_CHUNK_SIZE,
+                  samples: int = BWT_SAMPLES) -> tuple[bytes, list[int]]:
     """
     Обрабатывает блок данных: применяет BWT и RLE.
     Возвращает сжатые данные и индексы BWT.
     """
-    transformed_data, indices = bwt_transform(block)
-    compressed_data = rle_compress(transformed_data)
+    transformed_data, indices = bwt_transform(block, chunk_size, samples)
+    compressed_data = rle7_compress(transformed_data)
     return compressed_data, indices
 
-def process_file_in_blocks(file_path, output_compressed, output_decompressed):
+def process_file_in_blocks(file_path, output_compressed, output_decompressed,
+                           block_size=BLOCK_SIZE, chunk_size=BWT_CHUNK_SIZE, samples=BWT_SAMPLES):
+    if not 0 < block_size <= MAX_BLOCK_SIZE:
+        raise ValueError(f"Размер блока должен быть от 1 до {MAX_BLOCK_SIZE} байт")
+    if chunk_size < 0:
+        raise ValueError("Размер чанка BWT не может быть отрицательным")
+    validate_samples(samples)
+
     # Начало измерения времени
     start_time = time.time()
 
@@ -132,12 +47,14 @@ def process_file_in_blocks(file_path, output_compressed, output_decompressed):
         with open(file_path, "rb") as f:
             block_number = 0
             while True:
-                block = f.read(BLOCK_SIZE)
+                block = f.read(block_size)
                 if not block:
                     break
-                compressed_block, indices = process_block(block)
-                # Записываем номер блока, количество индексов, индексы BWT и сжатые данные
+                compressed_block, indices = process_block(block, chunk_size, samples)
+                # Записываем номер блока, размер чанка BWT, число выборок, количество индексов, индексы BWT и сжатые данные
                 compressed_file.write(block_number.to_bytes(4, byteorder='big'))
+                compressed_file.write(chunk_size.to_bytes(4, byteorder='big'))
+                compressed_file.write(samples.to_bytes(4, byteorder='big'))
                 compressed_file.write(len(indices).to_bytes(4, byteorder='big'))
                 for index in indices:
                     compressed_file.write(index.to_bytes(4, byteorder='big'))
@@ -159,6 +76,10 @@ def process_file_in_blocks(file_path, output_compressed, output_decompressed):
             if not block_number_bytes:
                 break
             block_number = int.from_bytes(block_number_bytes, byteorder='big')
+            # Читаем размер чанка BWT (0 - весь блок)
+            block_chunk_size = int.from_bytes(f.read(4), byteorder='big')
+            # Читаем число выборок строк на чанк
+            block_samples = int.from_bytes(f.read(4), byteorder='big')
             # Читаем количество индексов
             num_indices_bytes = f.read(4)
             num_indices = int.from_bytes(num_indices_bytes, byteorder='big')
@@ -168,14 +89,14 @@ def process_file_in_blocks(file_path, output_compressed, output_decompressed):
                 index_bytes = f.read(4)
                 indices.append(int.from_bytes(index_bytes, byteorder='big'))
             # Читаем размер сжатого блока
-            block_size_bytes = f.read(4)
-            block_size = int.from_bytes(block_size_bytes, byteorder='big')
+            compressed_size_bytes = f.read(4)
+            compressed_block_size = int.from_bytes(compressed_size_bytes, byteorder='big')
             # Читаем сжатые данные
-            compressed_block = f.read(block_size)
+            compressed_block = f.read(compressed_block_size)
             # Декомпрессия RLE
-            decompressed_transformed_data = rle_decompress(compressed_block)
+            decompressed_transformed_data = rle7_decompress(compressed_block)
             # Обратное преобразование BWT
-            decompressed_data = bwt_inverse(decompressed_transformed_data, indices)
+            decompressed_data = bwt_inverse(decompressed_transformed_data, indices, block_chunk_size, block_samples)
             # Сохраняем блок в словаре
             blocks[block_number] = decompressed_data
 
@@ -208,8 +129,9 @@ file_paths = [
 ]
 
 # Обработка каждого файла
-for i, file_path in enumerate(file_paths):
-    output_compressed = f"compressed_file_BWT+RLE_{i+1}.bin"
-    output_decompressed = f"decompressed_file_BWT+RLE_{i+1}.bin"
-    print(f"Обработка файла {file_path}...")
-    process_file_in_blocks(file_path, output_compressed, output_decompressed)
\ No newline at end of file
+if __name__ == "__main__":
+    for i, file_path in enumerate(file_paths):
+        output_compressed = f"compressed_file_BWT+RLE_{i+1}.bin"
+        output_decompressed = f"decompressed_file_BWT+RLE_{i+1}.bin"
+        print(f"Обработка файла {file_path}...")
+        process_file_in_blocks(file_path, output_compressed, output_decompressed)
@@ -1,106 +1,46 @@
+import os
+import sys
 import time
 
-# Функция для кодирования данных с помощью алгоритма LZ77
-def lz77_encode(data: bytes, buffer_size: int) -> bytes:
-    encoded_data = bytearray()
-    i = 0
-    n = len(data)
+# Сценарий запускается напрямую: пакет compressors импортируется из корня репозитория
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-    while i < n:
-        max_length = 0
-        max_offset = 0
+from compressors.lz77 import LZ77_BLOCK_SIZE, LZ77Decoder, LZ77Encoder
 
-        # Определяем границы поиска
-        search_start = max(0, i - buffer_size)
-        search_end = i
 
-        # Ищем максимальное совпадение
-        for length in range(min(255, n - i), 0, -1):
-            substring = data[i:i + length]
-            offset = data[search_start:search_end].rfind(substring)
-            if offset != -1:
-                max_length = length
-                max_offset = search_end - search_start - offset
-                break
-
-        if max_length > 0:
-            # Кодируем offset и length в два байта каждый
-            encoded_data.append((max_offset >> 8) & 0xFF)  # Старший байт offset
-            encoded_data.append(max_offset & 0xFF)  # Младший байт offset
-            encoded_data.append((max_length >> 8) & 0xFF)  # Старший байт length
-            encoded_data.append(max_length & 0xFF)  # Младший байт length
-            i += max_length
-        else:
-            # Если совпадений нет, кодируем как символ
-            encoded_data.append(0)  # offset = 0 (старший байт)
-            encoded_data.append(0)  # offset = 0 (младший байт)
-            encoded_data.append(0)  # length = 0 (старший байт)
-            encoded_data.append(0)  # length = 0 (младший байт)
-            encoded_data.append(data[i])  # символ (1 байт)
-            i += 1
-
-    return bytes(encoded_data)
-
-
-def lz77_decode(encoded_data: bytes) -> bytes:
-    decoded_data = bytearray()
-    i = 0
-    n = len(encoded_data)
-
-    while i < n:
-        # Читаем offset и length (по два байта каждый)
-        offset = (encoded_data[i] << 8) | encoded_data[i + 1]
-        length = (encoded_data[i + 2] << 8) | encoded_data[i + 3]
-        i += 4
-
-        if offset == 0 and length == 0:
-            # Это символ
-            decoded_data.append(encoded_data[i])
-            i += 1
-        else:
-            # Это ссылка
-            start = len(decoded_data) - offset
-            end = start + length
-            decoded_data.extend(decoded_data[start:end])
-
-    return bytes(decoded_data)
-
-
-# Функция для обработки файла с использованием LZ77
-def process_file_with_lz77(file_path, output_compressed, output_decompressed, buffer_size=1024):
+# Функция для обработки файла с использованием LZ77. Файл читается и сжимается
+# блоками, поэтому расход памяти не зависит от его размера
+def process_file_with_lz77(file_path, output_compressed, output_decompressed, level="default",
+                           independent_blocks=False, workers=1):
     start_time = time.time()
 
-    # Чтение исходных данных
-    with open(file_path, "rb") as f:
-        data = f.read()
-    original_size = len(data)
-    print(f"Исходный размер данных: {original_size} байт")
-
     # Сжатие данных с использованием LZ77
-    compressed_bytes = lz77_encode(data, buffer_size)
-    compressed_size = len(compressed_bytes)
+    encoder = LZ77Encoder(level, independent_blocks=independent_blocks, workers=workers)
+    original_size = 0
+    with open(file_path, "rb") as source, open(output_compressed, "wb") as file:
+        while chunk := source.read(LZ77_BLOCK_SIZE):
+            original_size += len(chunk)
+            file.write(encoder.feed(chunk))
+        file.write(encoder.flush())
+    print(f"Исходный размер данных: {original_size} байт")
+    compressed_size = os.path.getsize(output_compressed)
     print(f"Размер сжатых данных: {compressed_size} байт")
 
-    # Запись сжатых данных
-    with open(output_compressed, "wb") as file:
-        file.write(compressed_bytes)
-
     # Чтение сжатых данных и декомпрессия
-    with open(output_compressed, "rb") as f:
-        compressed_data = f.read()
-
-    decompressed_data = lz77_decode(compressed_data)
-    decompressed_size = len(decompressed_data)
+    decoder = LZ77Decoder()
+    decompressed_size = 0
+    with open(output_compressed, "rb") as source, open(output_decompressed, "wb") as file:
+        while chunk := source.read(LZ77_BLOCK_SIZE):
+            decompressed_data = decoder.feed(chunk)
+            decompressed_size += len(decompressed_data)
+            file.write(decompressed_data)
+        decoder.flush()
     print(f"Размер после декомпрессии: {decompressed_size} байт")
 
     # Вычисление коэффициента сжатия
     compression_ratio = original_size / compressed_size
     print(f"Коэффициент сжатия: {compression_ratio:.2f}")
 
-    # Запись декомпрессированных данных
-    with open(output_decompressed, "wb") as file:
-        file.write(decompressed_data)
-
     end_time = time.time()
     elapsed_time = end_time - start_time
     print(f"Время выполнения: {elapsed_time:.2f} секунд \n")
@@ -116,9 +56,11 @@ file_paths = [
     "C:/Users/79508/Desktop/4 семестри/АИСД/1 лабораторная/коди/буквы и картинки/enwik7"
 ]
 
-# Обработка каждого файла
-for i, file_path in enumerate(file_paths):
-    output_compressed = f"compressed_file_LZ77{i + 1}.bin"
-    output_decompressed = f"decompressed_file_LZ77{i + 1}.bin"
-    print(f"Обработка файла {file_path}...")
-    process_file_with_lz77(file_path, output_compressed, output_decompressed)
\ No newline at end of file
+# Обработка каждого файла. Проверка __main__ нужна пулу процессов: дочерние
+# процессы импортируют этот модуль и не должны повторно запускать обработку
+if __name__ == "__main__":
+    for i, file_path in enumerate(file_paths):
+        output_compressed = f"compressed_file_LZ77{i + 1}.bin"
+        output_decompressed = f"decompressed_file_LZ77{i + 1}.bin"
+        print(f"Обработка файла {file_path}...")
+        process_file_with_lz77(file_path, output_compressed, output_decompressed, workers=os.cpu_count())
\ No newline at end of file
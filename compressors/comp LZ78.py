@@ -1,59 +1,14 @@
+import os
+import sys
 import time
 
-# Функция для кодирования данных с помощью алгоритма LZ78
-def lz78_encode(data: bytes) -> bytes:
-    dictionary = {b'': 0}  # Инициализация словаря с пустой строкой
-    current_string = b''
-    encoded_data = bytearray()
+# Сценарий запускается напрямую: пакет compressors импортируется из корня репозитория
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-    for byte in data:
-        new_string = current_string + bytes([byte])
-        if new_string in dictionary:
-            current_string = new_string
-        else:
-            # Используем 4 байта для индекса
-            encoded_data.extend(dictionary[current_string].to_bytes(4, 'big'))  # Индекс текущей строки
-            encoded_data.append(byte)  # Новый символ
-            dictionary[new_string] = len(dictionary)  # Добавляем новую строку в словарь
-            current_string = b''
-
-    if current_string:
-        # Используем 4 байта для индекса
-        encoded_data.extend(dictionary[current_string].to_bytes(4, 'big'))  # Индекс последней строки
-
-    return bytes(encoded_data)
-
-# Функция для декодирования данных с помощью алгоритма LZ78
-def lz78_decode(encoded_data: bytes) -> bytes:
-    dictionary = {0: b''}  # Инициализация словаря с пустой строкой
-    decoded_data = bytearray()
-    i = 0
-
-    while i < len(encoded_data):
-        # Чтение индекса (4 байта)
-        index = int.from_bytes(encoded_data[i:i + 4], 'big')
-        i += 4
-        if i < len(encoded_data):
-            byte = encoded_data[i]  # Чтение нового символа
-            i += 1
-        else:
-            byte = None
-
-        if index in dictionary:
-            string = dictionary[index]
-            if byte is not None:
-                new_string = string + bytes([byte])
-                dictionary[len(dictionary)] = new_string
-                decoded_data.extend(new_string)
-            else:
-                decoded_data.extend(string)
-        else:
-            raise ValueError("Некорректный индекс в закодированных данных")
-
-    return bytes(decoded_data)
+from compressors.lz78 import lz78_compress, lz78_decompress
 
 # Функция для обработки файла с использованием LZ78
-def process_file_with_lz78(file_path, output_compressed, output_decompressed):
+def process_file_with_lz78(file_path, output_compressed, output_decompressed, mode="lzw"):
     start_time = time.time()
 
     # Чтение исходных данных
@@ -63,7 +18,7 @@ def process_file_with_lz78(file_path, output_compressed, output_decompressed):
     print(f"Исходный размер данных: {original_size} байт")
 
     # Сжатие данных с использованием LZ78
-    compressed_bytes = lz78_encode(data)
+    compressed_bytes = lz78_compress(data, mode)
     compressed_size = len(compressed_bytes)
     print(f"Размер сжатых данных: {compressed_size} байт")
 
@@ -75,7 +30,7 @@ def process_file_with_lz78(file_path, output_compressed, output_decompressed):
     with open(output_compressed, "rb") as f:
         compressed_data = f.read()
 
-    decompressed_data = lz78_decode(compressed_data)
+    decompressed_data = lz78_decompress(compressed_data)
     decompressed_size = len(decompressed_data)
     print(f"Размер после декомпрессии: {decompressed_size} байт")
 
@@ -102,8 +57,9 @@ file_paths = [
 ]
 
 # Обработка каждого файла
-for i, file_path in enumerate(file_paths):
-    output_compressed = f"compressed_file_LZ78_{i + 1}.bin"
-    output_decompressed = f"decompressed_file_LZ78_{i + 1}.bin"
-    print(f"Обработка файла {file_path}...")
-    process_file_with_lz78(file_path, output_compressed, output_decompressed)
\ No newline at end of file
+if __name__ == "__main__":
+    for i, file_path in enumerate(file_paths):
+        output_compressed = f"compressed_file_LZ78_{i + 1}.bin"
+        output_decompressed = f"decompressed_file_LZ78_{i + 1}.bin"
+        print(f"Обработка файла {file_path}...")
+        process_file_with_lz78(file_path, output_compressed, output_decompressed)
@@ -0,0 +1,290 @@
+"""
+Канонические коды Хаффмана с ограниченной длиной и табличным декодером.
+Сжатый поток: длины кодов всех символов алфавита, байт числа битов дополнения, биты кодов.
+"""
+import heapq
+from collections import defaultdict
+
+import numpy as np
+
+# Размер алфавита Хаффмана (байты)
+ALPHABET_SIZE = 256
+# Максимальная длина кода Хаффмана: ограничивает размер таблиц декодера
+MAX_CODE_LENGTH = 15
+# Предел длины кода: длины хранятся в заголовке по байту, а значение 0xFF не используется,
+# поэтому сжатый поток никогда не начинается с байта 0xFF (см. image.FILTERED_MARKER)
+CODE_LENGTH_LIMIT = 0xFE
+# Табличный декодер Хаффмана: первые TABLE_BITS бит потока определяют символ
+# одним обращением к основной таблице, более длинные коды дочитываются по вторичной
+# (не более MAX_CODE_LENGTH - TABLE_BITS шагов)
+TABLE_BITS = 10
+
+
+# Класс для узлов дерева Хаффмана
+class HuffmanNode:
+    def __init__(self, char=None, freq=0, left=None, right=None):
+        self.char = char
+        self.freq = freq
+        self.left = left
+        self.right = right
+
+    def __lt__(self, other):
+        return self.freq < other.freq
+
+
+# Дерево Хаффмана по словарю частот символов
+def build_huffman_tree(freq_dict):
+    heap = []
+    for char, freq in freq_dict.items():
+        heapq.heappush(heap, HuffmanNode(char=char, freq=freq))
+
+    while len(heap) > 1:
+        left = heapq.heappop(heap)
+        right = heapq.heappop(heap)
+        merged = HuffmanNode(freq=left.freq + right.freq, left=left, right=right)
+        heapq.heappush(heap, merged)
+
+    return heapq.heappop(heap)
+
+
+def build_huffman_codes(node, current_code="", codes=None):
+    if codes is None:
+        codes = {}
+    if node.char is not None:
+        # Единственный символ в блоке тоже должен занимать хотя бы один бит
+        codes[node.char] = current_code or "0"
+    else:
+        build_huffman_codes(node.left, current_code + "0", codes)
+        build_huffman_codes(node.right, current_code + "1", codes)
+    return codes
+
+
+def count_symb(data: bytes) -> np.ndarray:
+    counter = np.zeros(256, dtype=int)
+    for byte in data:
+        counter[byte] += 1
+    return counter
+
+
+# Упаковка кодов в байты: каждый код хранится парой (значение, длина в битах),
+# биты накапливаются в целом числе и сбрасываются в bytearray по 32 бита
+def pack_bits(data, codes: dict) -> tuple[bytes, int]:
+    table = [None] * (max(codes, default=-1) + 1)
+    for symbol, code in codes.items():
+        table[symbol] = (int(code, 2), len(code))
+
+    packed = bytearray()
+    accumulator = 0
+    bit_count = 0
+    for symbol in data:
+        value, length = table[symbol]
+        accumulator = (accumulator << length) | value
+        bit_count += length
+        if bit_count >= 32:
+            bit_count -= 32
+            packed += (accumulator >> bit_count).to_bytes(4, 'big')
+            accumulator &= (1 << bit_count) - 1
+
+    # Дополнение нулями до целого байта (от 0 до 7 бит)
+    padding = -bit_count % 8
+    packed += (accumulator << padding).to_bytes((bit_count + padding) // 8, 'big')
+    return bytes(packed), padding
+
+
+# Ограничение длины кодов Хаффмана (эвристика JPEG, приложение K.3): пока есть коды
+# длиннее max_length, два самых длинных листа заменяются одним листом на уровень выше,
+# а освободившееся место занимает лист с ближайшего более короткого уровня.
+# Затем длины заново раздаются символам в порядке исходных длин (частые - короче)
+def limit_code_lengths(lengths: dict, max_length: int = MAX_CODE_LENGTH) -> dict:
+    if not lengths or max(lengths.values()) <= max_length:
+        return lengths
+    if len(lengths) > 1 << max_length:
+        raise ValueError(f"{len(lengths)} символов не помещаются в коды длиной {max_length} бит")
+
+    longest = max(lengths.values())
+    length_counts = [0] * (longest + 1)
+    for length in lengths.values():
+        length_counts[length] += 1
+
+    for length in range(longest, max_length, -1):
+        while length_counts[length] > 0:
+            shorter = length - 2
+            while length_counts[shorter] == 0:
+                shorter -= 1
+            length_counts[length] -= 2
+            length_counts[length - 1] += 1
+            length_counts[shorter + 1] += 2
+            length_counts[shorter] -= 1
+
+    limited = {}
+    symbols = iter(sorted(lengths, key=lambda symbol: (lengths[symbol], symbol)))
+    for length in range(1, max_length + 1):
+        for _ in range(length_counts[length]):
+            limited[next(symbols)] = length
+    return limited
+
+
+# Канонические коды Хаффмана: коды однозначно восстанавливаются по одним длинам.
+# Символы упорядочиваются по (длине, значению) и получают последовательные коды
+def canonical_codes(lengths: dict) -> dict:
+    codes = {}
+    code = 0
+    previous_length = 0
+    for symbol, length in sorted(lengths.items(), key=lambda item: (item[1], item[0])):
+        code <<= length - previous_length
+        codes[symbol] = format(code, f"0{length}b")
+        code += 1
+        previous_length = length
+    return codes
+
+
+# Заголовок с длинами кодов всех символов алфавита: ненулевая длина занимает байт,
+# серия отсутствующих символов записывается парой (0, длина серии)
+def serialize_code_lengths(codes: dict, alphabet_size: int = ALPHABET_SIZE) -> bytes:
+    lengths = [0] * alphabet_size
+    for symbol, code in codes.items():
+        lengths[symbol] = len(code)
+    serialized = bytearray()
+    i = 0
+    while i < alphabet_size:
+        if lengths[i]:
+            serialized.append(lengths[i])
+            i += 1
+        else:
+            run = 1
+            while i + run < alphabet_size and run < 255 and lengths[i + run] == 0:
+                run += 1
+            serialized.extend((0, run))
+            i += run
+    return bytes(serialized)
+
+
+# Возвращает канонические коды и позицию сразу после заголовка
+def deserialize_code_lengths(data: bytes, alphabet_size: int = ALPHABET_SIZE) -> tuple[dict, int]:
+    lengths = {}
+    symbol = 0
+    i = 0
+    while symbol < alphabet_size:
+        if data[i]:
+            lengths[symbol] = data[i]
+            symbol += 1
+            i += 1
+        else:
+            symbol += data[i + 1]
+            i += 2
+    return canonical_codes(lengths), i
+
+
+def build_decode_table(codes: dict, table_bits: int = TABLE_BITS) -> tuple[list, dict]:
+    table = [None] * (1 << table_bits)
+    long_codes = {}
+    for symbol, code in codes.items():
+        length = len(code)
+        value = int(code, 2)
+        if length <= table_bits:
+            # Код занимает все ячейки, начинающиеся с его битов
+            shift = table_bits - length
+            table[value << shift:(value + 1) << shift] = [(symbol, length)] * (1 << shift)
+        else:
+            long_codes[(length, value)] = symbol
+    return table, long_codes
+
+
+def unpack_bits(payload: bytes, bit_total: int, codes: dict) -> list[int]:
+    if not codes:
+        return []
+    table, long_codes = build_decode_table(codes)
+    max_length = max(len(code) for code in codes.values())
+    mask = (1 << TABLE_BITS) - 1
+    # Нули в конце позволяют заглядывать вперёд без проверок границ
+    data = bytes(payload) + bytes(max_length // 8 + 8)
+
+    symbols = []
+    accumulator = 0
+    bit_count = 0
+    position = 0
+    remaining = bit_total
+    while remaining > 0:
+        while bit_count < TABLE_BITS:
+            accumulator = ((accumulator & ((1 << bit_count) - 1)) << 64) | int.from_bytes(data[position:position + 8], 'big')
+            position += 8
+            bit_count += 64
+        entry = table[(accumulator >> (bit_count - TABLE_BITS)) & mask]
+        if entry is not None:
+            symbol, length = entry
+        else:
+            # Длинный код: дочитываем по одному биту и ищем во вторичной таблице
+            length = TABLE_BITS
+            symbol = None
+            while symbol is None:
+                length += 1
+                if length > max_length:
+                    raise ValueError("Некорректные данные Хаффмана")
+                while bit_count < length:
+                    accumulator = ((accumulator & ((1 << bit_count) - 1)) << 64) | int.from_bytes(data[position:position + 8], 'big')
+                    position += 8
+                    bit_count += 64
+                symbol = long_codes.get((length, (accumulator >> (bit_count - length)) & ((1 << length) - 1)))
+        if length > remaining:
+            break
+        symbols.append(symbol)
+        bit_count -= length
+        remaining -= length
+    return symbols
+
+
+def huffman_encode_symbols(symbols, alphabet_size: int = ALPHABET_SIZE, max_code_length: int = MAX_CODE_LENGTH,
+                           freq_dict: dict | None = None) -> tuple[bytes, dict]:
+    """
+    Сжимает последовательность символов алфавита из alphabet_size символов
+    кодами не длиннее max_code_length бит. Возвращает сжатые данные и коды Хаффмана.
+    freq_dict - частоты символов; по умолчанию подсчитываются в порядке первого появления.
+    Порядок ключей задаёт порядок листьев в куче, то есть выбор среди равных частот.
+    """
+    if not 0 < max_code_length <= CODE_LENGTH_LIMIT:
+        raise ValueError(f"Максимальная длина кода должна быть от 1 до {CODE_LENGTH_LIMIT} бит")
+    if freq_dict is None:
+        freq_dict = defaultdict(int)
+        for symbol in symbols:
+            freq_dict[symbol] += 1
+
+    if len(freq_dict) == 0:
+        return bytes(), {}
+
+    root = build_huffman_tree(freq_dict)
+    # Дерево задаёт только длины кодов (с ограничением max_code_length), сами коды - канонические
+    lengths = {symbol: len(code) for symbol, code in build_huffman_codes(root).items()}
+    codes = canonical_codes(limit_code_lengths(lengths, max_code_length))
+
+    packed, padding = pack_bits(symbols, codes)
+    return serialize_code_lengths(codes, alphabet_size) + bytes([padding]) + packed, codes
+
+
+def huffman_decode_symbols(compressed_data: bytes, alphabet_size: int = ALPHABET_SIZE) -> list[int]:
+    """
+    Восстанавливает последовательность символов, сжатую huffman_encode_symbols.
+    """
+    if len(compressed_data) == 0:
+        return []
+
+    huffman_codes, position = deserialize_code_lengths(compressed_data, alphabet_size)
+    padding = compressed_data[position]
+    bit_total = (len(compressed_data) - position - 1) * 8 - padding
+    return unpack_bits(compressed_data[position + 1:], bit_total, huffman_codes)
+
+
+def huffman_compress(data: bytes, max_code_length: int = MAX_CODE_LENGTH) -> tuple[bytes, dict]:
+    """
+    Сжимает байты кодом Хаффмана, возвращает сжатые данные и коды.
+    Листья добавляются в кучу в порядке значений байтов, как в исходном кодере HA.
+    """
+    counter = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=ALPHABET_SIZE)
+    freq_dict = {symbol: int(counter[symbol]) for symbol in np.flatnonzero(counter).tolist()}
+    return huffman_encode_symbols(data, ALPHABET_SIZE, max_code_length, freq_dict)
+
+
+def huffman_decompress(compressed_data: bytes) -> bytes:
+    """
+    Декомпрессия данных, сжатых huffman_compress.
+    """
+    return bytes(huffman_decode_symbols(compressed_data))
@@ -0,0 +1,139 @@
+"""
+Raw-изображения: разбор заголовка и стадия предварительной фильтрации строк (как в PNG).
+"""
+import numpy as np
+
+# Виды raw-изображений и число байт на пиксель. Файл начинается заголовком "kind,width,height\n"
+RAW_IMAGE_CHANNELS = {"bw": 1, "gray": 1, "color": 3}
+# Фильтры строк изображения (как в PNG): без фильтра, разность с соседом слева,
+# сверху, со средним этих соседей и с предсказателем Паэта
+IMAGE_FILTERS = {"none": 0, "sub": 1, "up": 2, "average": 3, "paeth": 4}
+# Признак перед кодом Хаффмана для данных, прошедших фильтрацию изображений. Код Хаффмана
+# начинается с длины кода первого символа (не больше huffman.CODE_LENGTH_LIMIT) или нуля,
+# поэтому признак однозначен, а без фильтрации к коду ничего не добавляется
+FILTERED_MARKER = b"\xff"
+
+
+def parse_raw_header(data: bytes) -> tuple[str, int, int, int] | None:
+    """
+    Разбирает заголовок raw-изображения "kind,width,height\\n".
+    Возвращает вид, ширину, высоту и начало пикселей либо None, если заголовка нет.
+    """
+    # Заголовок ищется в первых байтах; копия нужна, если данные переданы как memoryview
+    head = bytes(data[:64])
+    end = head.find(b"\n")
+    if end == -1:
+        return None
+    fields = head[:end].split(b",")
+    if len(fields) != 3 or not fields[1].isdigit() or not fields[2].isdigit():
+        return None
+    kind = fields[0].decode("ascii", "replace")
+    width, height = int(fields[1]), int(fields[2])
+    if kind not in RAW_IMAGE_CHANNELS or width == 0:
+        return None
+    return kind, width, height, end + 1
+
+
+def paeth_predictor(left: np.ndarray, up: np.ndarray, up_left: np.ndarray) -> np.ndarray:
+    """
+    Предсказатель Паэта: из трёх соседей выбирается ближайший к left + up - up_left.
+    """
+    estimate = left + up - up_left
+    distance_left = np.abs(estimate - left)
+    distance_up = np.abs(estimate - up)
+    distance_up_left = np.abs(estimate - up_left)
+    return np.where((distance_left <= distance_up) & (distance_left <= distance_up_left), left,
+                    np.where(distance_up <= distance_up_left, up, up_left))
+
+
+def filter_predictions(left: np.ndarray, up: np.ndarray, up_left: np.ndarray) -> np.ndarray:
+    """
+    Предсказания всех фильтров, по первой оси - в порядке номеров IMAGE_FILTERS.
+    """
+    return np.stack([np.zeros_like(left), left, up, (left + up) >> 1, paeth_predictor(left, up, up_left)])
+
+
+def filter_image(data: bytes) -> bytes | None:
+    """
+    Фильтрация raw-изображения перед сжатием (как в PNG). Чередующиеся каналы RGB
+    разделяются на плоскости, в каждой строке плоскости пиксели заменяются разностью
+    с предсказанием того фильтра, у которого меньше сумма модулей разностей.
+    Результат: заголовок изображения, затем по плоскостям строки (номер фильтра, разности).
+    Возвращает None, если данные не являются полутоновым или цветным raw-изображением.
+    """
+    raw_header = parse_raw_header(data)
+    if raw_header is None:
+        return None
+    kind, width, height, offset = raw_header
+    channels = RAW_IMAGE_CHANNELS[kind]
+    # Двухцветные изображения не фильтруются: разности только дробят серии
+    if kind == "bw" or width * height * channels != len(data) - offset or height == 0:
+        return None
+    pixels = np.frombuffer(data, dtype=np.uint8, offset=offset)
+    planes = pixels.reshape(height, width, channels).transpose(2, 0, 1).astype(np.int16)
+
+    # Соседи слева, сверху и сверху слева; за краем изображения - нули
+    padded = np.zeros((channels, height + 1, width + 1), dtype=np.int16)
+    padded[:, 1:, 1:] = planes
+    predictions = filter_predictions(padded[:, 1:, :-1], padded[:, :-1, 1:], padded[:, :-1, :-1])
+    residuals = (planes - predictions) & 0xFF
+
+    # Разности оцениваются как числа со знаком: 255 - это -1
+    cost = np.minimum(residuals, 256 - residuals).sum(axis=3)
+    filters = cost.argmin(axis=0)
+    rows = np.empty((channels, height, width + 1), dtype=np.uint8)
+    rows[:, :, 0] = filters
+    rows[:, :, 1:] = np.take_along_axis(residuals, filters[None, :, :, None], axis=0)[0]
+    return bytes(data[:offset]) + rows.tobytes()
+
+
+def unfilter_image(filtered: bytes) -> bytes:
+    """
+    Обратная фильтрация. Пиксель зависит от уже восстановленных соседей слева и сверху,
+    поэтому пиксели восстанавливаются по антидиагоналям: за шаг k - все пиксели
+    с row + column == k во всех плоскостях сразу.
+    """
+    raw_header = parse_raw_header(filtered)
+    if raw_header is None:
+        raise ValueError("Некорректные отфильтрованные данные: нет заголовка изображения")
+    kind, width, height, offset = raw_header
+    channels = RAW_IMAGE_CHANNELS[kind]
+    if channels * height * (width + 1) != len(filtered) - offset:
+        raise ValueError("Некорректные отфильтрованные данные: размер не соответствует изображению")
+    rows = np.frombuffer(filtered, dtype=np.uint8, offset=offset).reshape(channels, height, width + 1)
+    filters = rows[:, :, 0].astype(np.intp)
+    if filters.max(initial=0) >= len(IMAGE_FILTERS):
+        raise ValueError("Некорректные отфильтрованные данные: неизвестный фильтр")
+    residuals = rows[:, :, 1:].astype(np.int16)
+
+    padded = np.zeros((channels, height + 1, width + 1), dtype=np.int16)
+    for k in range(height + width - 1):
+        row = np.arange(max(0, k - width + 1), min(height - 1, k) + 1)
+        column = k - row
+        predictions = filter_predictions(padded[:, row + 1, column], padded[:, row, column + 1], padded[:, row, column])
+        prediction = np.take_along_axis(predictions, filters[None, :, row], axis=0)[0]
+        padded[:, row + 1, column + 1] = (residuals[:, row, column] + prediction) & 0xFF
+    pixels = padded[:, 1:, 1:].transpose(1, 2, 0).astype(np.uint8)
+    return bytes(filtered[:offset]) + pixels.tobytes()
+
+
+def apply_prefilter(data: bytes, prefilter: bool = True) -> bytes:
+    """
+    Стадия предварительной фильтрации: первый байт - признак фильтрации (1, если
+    prefilter включён и данные - изображение), за ним данные для следующих стадий.
+    """
+    filtered = filter_image(data) if prefilter else None
+    if filtered is None:
+        return b"\x00" + data
+    return b"\x01" + filtered
+
+
+def remove_prefilter(data: bytes) -> bytes:
+    """
+    Обращает apply_prefilter по признаку в первом байте.
+    """
+    if data[:1] == b"\x01":
+        return unfilter_image(data[1:])
+    if data[:1] == b"\x00":
+        return data[1:]
+    raise ValueError("Некорректные данные: неизвестный признак фильтрации")
@@ -0,0 +1,449 @@
+"""
+LZ77 с хэш-цепочками, тремя способами разбора (жадный, ленивый, оптимальный)
+и потоковым блочным кодированием.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from .varint import read_varint, varint_complete, varint_size, write_varint
+
+# Наименьшая длина ссылки; по стольким же первым байтам позиции собираются в хэш-цепочки
+MIN_MATCH_LENGTH = 3
+# Наибольшая длина ссылки
+MAX_MATCH_LENGTH = 64 * 1024
+# Глубина хэш-цепочки: сколько предыдущих позиций проверяется при поиске совпадения
+LZ77_CHAIN_DEPTH = 64
+# Оптимальный разбор не ищет совпадения внутри ссылок не короче этой длины
+OPTIMAL_SKIP_LENGTH = 32
+# Уровни сжатия LZ77: размер буфера поиска, глубина хэш-цепочки и способ разбора.
+# fast - жадный разбор с короткими цепочками, default - ленивый разбор,
+# max - оптимальный разбор по всему файлу
+LZ77_LEVELS = {
+    "fast": {"buffer_size": 64 * 1024, "chain_depth": 8, "parser": "greedy"},
+    "default": {"buffer_size": 1024 * 1024, "chain_depth": 32, "parser": "lazy"},
+    "max": {"buffer_size": 8 * 1024 * 1024, "chain_depth": 256, "parser": "optimal"},
+}
+# Размер блока потокового кодера: столько входных байт кодируется за один раз
+LZ77_BLOCK_SIZE = 1024 * 1024
+
+# Формат кода LZ77 - последовательность токенов. Токен - серия символов, за которой
+# следует ссылка: varint(число символов), символы, varint(length - MIN_MATCH_LENGTH),
+# varint(offset - 1). Код завершается серией символов без ссылки (возможно, пустой)
+
+
+# Функция для кодирования данных с помощью алгоритма LZ77.
+# data[:start] - уже закодированная история: кодируется только data[start:],
+# а ссылки могут указывать и в историю
+def lz77_encode(data: bytes, buffer_size: int, chain_depth: int = LZ77_CHAIN_DEPTH, parser: str = "greedy",
+                start: int = 0) -> bytes:
+    if buffer_size <= 0:
+        raise ValueError("Размер буфера должен быть положительным")
+    # Буфер длиннее данных ничего не даёт, а кольцевой массив цепочек занимает память
+    buffer_size = min(buffer_size, max(len(data), 1))
+
+    encoded_data = bytearray()
+    if parser == "greedy":
+        lz77_parse_greedy(data, buffer_size, chain_depth, encoded_data, start)
+    elif parser == "lazy":
+        lz77_parse_lazy(data, buffer_size, chain_depth, encoded_data, start)
+    elif parser == "optimal":
+        lz77_parse_optimal(data, buffer_size, chain_depth, encoded_data, start)
+    else:
+        raise ValueError(f"Неизвестный способ разбора: {parser}")
+    return bytes(encoded_data)
+
+
+# Токен: серия символов data[literal_start:i] и ссылка (offset, length) из позиции i
+def append_sequence(encoded_data: bytearray, data: bytes, literal_start: int, i: int, offset: int, length: int):
+    write_varint(encoded_data, i - literal_start)
+    encoded_data += data[literal_start:i]
+    write_varint(encoded_data, length - MIN_MATCH_LENGTH)
+    write_varint(encoded_data, offset - 1)
+
+
+# Завершающая серия символов без ссылки
+def append_last_literals(encoded_data: bytearray, data: bytes, literal_start: int):
+    write_varint(encoded_data, len(data) - literal_start)
+    encoded_data += data[literal_start:]
+
+
+# Добавляет позиции start..end-1 в хэш-цепочки. head: префикс -> последняя позиция
+# с ним, prev: предыдущая позиция с тем же префиксом. prev - кольцевой массив размером
+# с буфер: более старые позиции всё равно лежат за границей поиска
+def insert_positions(data: bytes, start: int, end: int, head: dict, prev: list, buffer_size: int):
+    for position in range(start, end):
+        key = data[position:position + MIN_MATCH_LENGTH]
+        prev[position % buffer_size] = head.get(key, -1)
+        head[key] = position
+
+
+# Длина общего начала data[candidate:] и data[i:], не больше limit.
+# Сравнение идёт кусками по 256, 16 и 1 байту
+def match_length(data: bytes, candidate: int, i: int, limit: int) -> int:
+    length = 0
+    for step in (256, 16, 1):
+        while length + step <= limit and data[candidate + length:candidate + length + step] == data[i + length:i + length + step]:
+            length += step
+    return length
+
+
+# Длина общего конца data[:candidate] и data[:i], не больше limit
+def match_length_backward(data: bytes, candidate: int, i: int, limit: int) -> int:
+    length = 0
+    for step in (256, 16, 1):
+        while length + step <= limit and data[candidate - length - step:candidate - length] == data[i - length - step:i - length]:
+            length += step
+    return length
+
+
+# Ссылка выгодна, только если её код короче заменяемых ею символов: короткое совпадение
+# с дальним смещением занимает не меньше места, чем сами символы
+def match_profitable(length: int, offset: int) -> bool:
+    return varint_size(length - MIN_MATCH_LENGTH) + varint_size(offset - 1) < length
+
+
+# Самое длинное выгодное совпадение для позиции i: (длина, смещение), (0, 0) если такого
+# совпадения нет. Все позиции до i должны быть уже добавлены в цепочки
+def find_match(data: bytes, i: int, head: dict, prev: list, buffer_size: int, chain_depth: int) -> tuple[int, int]:
+    max_length = 0
+    max_offset = 0
+
+    # Определяем границы поиска
+    search_start = max(0, i - buffer_size)
+    length_limit = min(MAX_MATCH_LENGTH, len(data) - i)
+    if length_limit < MIN_MATCH_LENGTH:
+        return 0, 0
+
+    # Ищем максимальное совпадение среди позиций с тем же префиксом, от ближних к дальним
+    candidate = head.get(data[i:i + MIN_MATCH_LENGTH], -1)
+    depth = chain_depth
+    periodic_start = i
+    while candidate >= search_start and depth > 0:
+        if candidate >= periodic_start:
+            # Копии внутри уже найденного периодичного участка не дают более длинного совпадения
+            candidate = prev[candidate % buffer_size]
+            continue
+        # Кандидат может оказаться длиннее лучшего, только если совпадает следующий за ним байт.
+        # Совпадение может заходить за текущую позицию (length > offset): декодер
+        # восстанавливает такую ссылку, повторяя её первые offset байт
+        if data[candidate + max_length] == data[i + max_length]:
+            length = match_length(data, candidate, i, length_limit)
+            if length > max_length and match_profitable(length, i - candidate):
+                max_length = length
+                max_offset = i - candidate
+                if length == length_limit:
+                    break
+            if length >= i - candidate:
+                # Ссылка перекрывает сама себя: данные перед i повторяются с периодом
+                # i - candidate. Находим начало этого участка, чтобы не тратить глубину
+                # цепочки на его позиции (например, на серии одинаковых байт)
+                periodic_start = candidate - match_length_backward(data, candidate, i, candidate - search_start)
+        candidate = prev[candidate % buffer_size]
+        depth -= 1
+
+    if max_length < MIN_MATCH_LENGTH:
+        return 0, 0
+    return max_length, max_offset
+
+
+# Жадный разбор: в каждой позиции берётся самое длинное найденное совпадение
+def lz77_parse_greedy(data: bytes, buffer_size: int, chain_depth: int, encoded_data: bytearray, start: int = 0):
+    head = {}
+    prev = [-1] * buffer_size
+    # Из истории в цепочки попадает только то, что помещается в буфер поиска
+    inserted = max(0, start - buffer_size)
+    literal_start = start
+    i = start
+    n = len(data)
+
+    while i < n:
+        # Добавляем в цепочки позиции, пройденные на предыдущем шаге
+        insert_positions(data, inserted, i, head, prev, buffer_size)
+        inserted = i
+
+        length, offset = find_match(data, i, head, prev, buffer_size, chain_depth)
+        if length > 0:
+            append_sequence(encoded_data, data, literal_start, i, offset, length)
+            i += length
+            literal_start = i
+        else:
+            i += 1
+
+    append_last_literals(encoded_data, data, literal_start)
+
+
+# Ленивый разбор: прежде чем взять совпадение, проверяется позиция i + 1. Если там
+# совпадение длиннее, сравниваются два варианта: текущая ссылка и следующая за ней,
+# либо символ и ссылка из i + 1. Выбирается вариант, покрывающий больше данных
+def lz77_parse_lazy(data: bytes, buffer_size: int, chain_depth: int, encoded_data: bytearray, start: int = 0):
+    head = {}
+    prev = [-1] * buffer_size
+    # Из истории в цепочки попадает только то, что помещается в буфер поиска
+    inserted = max(0, start - buffer_size)
+    literal_start = start
+    i = start
+    n = len(data)
+    next_match = None
+
+    while i < n:
+        insert_positions(data, inserted, i, head, prev, buffer_size)
+        inserted = i
+
+        length, offset = next_match or find_match(data, i, head, prev, buffer_size, chain_depth)
+        next_match = None
+        if length == 0:
+            i += 1
+            continue
+
+        if length < MAX_MATCH_LENGTH and i + 1 < n:
+            insert_positions(data, i, i + 1, head, prev, buffer_size)
+            inserted = i + 1
+            shifted = find_match(data, i + 1, head, prev, buffer_size, chain_depth)
+            if shifted[0] > length:
+                # Продолжение после текущей ссылки оценивается по уже добавленным позициям:
+                # позиции впереди i в цепочки не попадают
+                following = find_match(data, i + length, head, prev, buffer_size, chain_depth)[0] if i + length < n else 0
+                if 1 + shifted[0] > length + following:
+                    next_match = shifted
+                    i += 1
+                    continue
+
+        append_sequence(encoded_data, data, literal_start, i, offset, length)
+        i += length
+        literal_start = i
+
+    append_last_literals(encoded_data, data, literal_start)
+
+
+# Оптимальный разбор: совпадения ищутся в каждой позиции, затем обратным проходом
+# выбирается разбиение с наименьшим размером кода. Символ стоит байт (заголовки серий
+# не учитываются), ссылка - размер двух varint. Ссылку можно укоротить до любой длины
+# от MIN_MATCH_LENGTH, поэтому из позиции i достижима любая из i+MIN_MATCH_LENGTH..i+length
+def lz77_parse_optimal(data: bytes, buffer_size: int, chain_depth: int, encoded_data: bytearray, start: int = 0):
+    head = {}
+    prev = [-1] * buffer_size
+    n = len(data)
+    insert_positions(data, max(0, start - buffer_size), start, head, prev, buffer_size)
+    # Массивы разбора хранят только кодируемую часть: lengths[i - start] относится к позиции i
+    lengths = [0] * (n - start)
+    offsets = [0] * (n - start)
+    i = start
+    while i < n:
+        length, offset = find_match(data, i, head, prev, buffer_size, chain_depth)
+        lengths[i - start] = length
+        offsets[i - start] = offset
+        if length < OPTIMAL_SKIP_LENGTH:
+            insert_positions(data, i, i + 1, head, prev, buffer_size)
+            i += 1
+            continue
+        # Внутри длинного совпадения поиск не выполняется: разбор может закончить
+        # ссылку в любой его позиции
+        insert_positions(data, i, i + length, head, prev, buffer_size)
+        i += length
+
+    # Диапазоны длин ссылки, в которых varint(length - MIN_MATCH_LENGTH) занимает size байт
+    length_ranges = []
+    first, size = MIN_MATCH_LENGTH, 1
+    while first <= MAX_MATCH_LENGTH:
+        last = MIN_MATCH_LENGTH + (1 << 7 * size) - 1
+        length_ranges.append((first, last, size))
+        first, size = last + 1, size + 1
+
+    # cost[k] - наименьший размер кода для data[start + k:], lengths[k] - длина выбранной ссылки
+    cost = [0] * (n - start + 1)
+    for i in range(n - start - 1, -1, -1):
+        best = cost[i + 1] + 1
+        choice = 0
+        length = lengths[i]
+        if length > 0:
+            offset_size = varint_size(offsets[i] - 1)
+            for first, last, size in length_ranges:
+                if first > length:
+                    break
+                last = min(last, length)
+                reachable = cost[i + first:i + last + 1]
+                smallest = min(reachable)
+                if smallest + offset_size + size <= best:
+                    best = smallest + offset_size + size
+                    # Из равноценных вариантов берём самую длинную ссылку
+                    choice = last - reachable[::-1].index(smallest)
+        cost[i] = best
+        lengths[i] = choice
+
+    literal_start = start
+    i = start
+    while i < n:
+        if lengths[i - start] > 0:
+            append_sequence(encoded_data, data, literal_start, i, offsets[i - start], lengths[i - start])
+            i += lengths[i - start]
+            literal_start = i
+        else:
+            i += 1
+
+    append_last_literals(encoded_data, data, literal_start)
+
+
+# Декодирование LZ77. history - данные, предшествующие коду: ссылки могут указывать
+# в неё, но в результат она не входит
+def lz77_decode(encoded_data: bytes, history: bytes = b"") -> bytes:
+    decoded_data = bytearray(history)
+    i = 0
+    n = len(encoded_data)
+
+    while i < n:
+        # Серия символов
+        literal_count, i = read_varint(encoded_data, i)
+        decoded_data += encoded_data[i:i + literal_count]
+        i += literal_count
+        if i >= n:
+            break
+
+        # Ссылка
+        length, i = read_varint(encoded_data, i)
+        offset, i = read_varint(encoded_data, i)
+        length += MIN_MATCH_LENGTH
+        offset += 1
+        start = len(decoded_data) - offset
+        if length <= offset:
+            decoded_data += decoded_data[start:start + length]
+        else:
+            # Ссылка перекрывает сама себя: данные повторяют последние offset байт.
+            # Повтор строится умножением bytes (копирование удвоением), а не по байту
+            period = decoded_data[start:]
+            decoded_data += (period * -(-length // offset))[:length]
+
+    return bytes(decoded_data[len(history):])
+
+
+# Потоковый формат LZ77: заголовок varint(размер буфера поиска), байт флага независимых
+# блоков, затем блоки varint(длина кода) + код LZ77 блока. Ссылки блока могут указывать
+# в последние buffer_size байт предыдущих блоков, если блоки не независимые
+
+# Кодирование одного блока потока: data[:start] - окно предыдущих данных, которое
+# служит словарём, но в код не попадает. Возвращает блок с префиксом длины
+def lz77_encode_frame(data: bytes, start: int, params: dict) -> bytes:
+    code = lz77_encode(data, **params, start=start)
+    frame = bytearray()
+    write_varint(frame, len(code))
+    frame += code
+    return bytes(frame)
+
+
+# Потоковый кодер LZ77: данные подаются кусками через feed, между вызовами хранятся
+# только буфер поиска (окно) и ещё не закодированный хвост.
+# При workers > 1 блоки кодируются параллельно в пуле процессов: накапливается по
+# workers блоков, каждому передаётся его окно из исходных данных. Код совпадает
+# с последовательным кодированием
+class LZ77Encoder:
+    def __init__(self, level: str = "default", block_size: int = LZ77_BLOCK_SIZE, independent_blocks: bool = False,
+                 workers: int = 1):
+        if level not in LZ77_LEVELS:
+            raise ValueError(f"Неизвестный уровень сжатия: {level}")
+        if block_size <= 0:
+            raise ValueError("Размер блока должен быть положительным")
+        if workers <= 0:
+            raise ValueError("Число процессов должно быть положительным")
+        self.params = LZ77_LEVELS[level]
+        self.buffer_size = self.params["buffer_size"]
+        self.block_size = block_size
+        # Независимые блоки начинаются с пустого окна и декодируются по отдельности
+        self.independent_blocks = independent_blocks
+        self.workers = workers
+        self.executor = None
+        self.window = b""
+        self.pending = bytearray()
+        self.header_written = False
+
+    def feed(self, chunk: bytes) -> bytes:
+        self.pending += chunk
+        output = bytearray(self.header())
+        batch_size = self.block_size * self.workers
+        while len(self.pending) >= batch_size:
+            output += self.encode_pending(batch_size)
+        return bytes(output)
+
+    def flush(self) -> bytes:
+        output = bytearray(self.header())
+        if self.pending:
+            output += self.encode_pending(len(self.pending))
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        return bytes(output)
+
+    def header(self) -> bytes:
+        if self.header_written:
+            return b""
+        self.header_written = True
+        header = bytearray()
+        write_varint(header, self.buffer_size)
+        header.append(int(self.independent_blocks))
+        return bytes(header)
+
+    # Кодирует первые size байт хвоста блоками по block_size
+    def encode_pending(self, size: int) -> bytes:
+        data = self.window + bytes(self.pending[:size])
+        del self.pending[:size]
+
+        blocks = []
+        starts = []
+        for block_start in range(len(self.window), len(data), self.block_size):
+            block_end = min(block_start + self.block_size, len(data))
+            window_start = block_start if self.independent_blocks else max(0, block_start - self.buffer_size)
+            blocks.append(data[window_start:block_end])
+            starts.append(block_start - window_start)
+
+        if self.workers > 1 and len(blocks) > 1:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(self.workers)
+            frames = self.executor.map(lz77_encode_frame, blocks, starts, repeat(self.params))
+        else:
+            frames = map(lz77_encode_frame, blocks, starts, repeat(self.params))
+        encoded = b"".join(frames)
+
+        if not self.independent_blocks:
+            self.window = data[-self.buffer_size:]
+        return encoded
+
+
+# Потоковый декодер LZ77: принимает код кусками произвольной длины и возвращает
+# данные каждого полностью полученного блока
+class LZ77Decoder:
+    def __init__(self):
+        self.buffer = bytearray()
+        self.window = b""
+        self.buffer_size = None
+        self.independent_blocks = False
+
+    def feed(self, chunk: bytes) -> bytes:
+        self.buffer += chunk
+        output = bytearray()
+        position = 0
+        if self.buffer_size is None:
+            # Заголовок: varint(размер буфера поиска) и байт флага независимых блоков
+            if not varint_complete(self.buffer, 0):
+                return b""
+            buffer_size, position = read_varint(self.buffer, 0)
+            if position >= len(self.buffer):
+                return b""
+            self.buffer_size = buffer_size
+            self.independent_blocks = bool(self.buffer[position])
+            position += 1
+        # Блок декодируется, когда получены его длина и весь код
+        while varint_complete(self.buffer, position):
+            length, code_start = read_varint(self.buffer, position)
+            if code_start + length > len(self.buffer):
+                break
+            history = b"" if self.independent_blocks else self.window
+            block = lz77_decode(bytes(self.buffer[code_start:code_start + length]), history)
+            if not self.independent_blocks:
+                self.window = (self.window + block)[-self.buffer_size:]
+            output += block
+            position = code_start + length
+        del self.buffer[:position]
+        return bytes(output)
+
+    def flush(self) -> bytes:
+        if self.buffer or self.buffer_size is None:
+            raise ValueError("Поток LZ77 оборван")
+        return b""
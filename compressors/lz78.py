@@ -0,0 +1,326 @@
+"""
+LZ78 (фразы из индекса префикса и символа) и LZW с кодами растущей ширины
+и ограниченным словарём.
+"""
+import struct
+from array import array
+from collections import OrderedDict
+
+# Режимы сжатия: классический LZ78 (4 байта индекса и символ на фразу) и LZW
+# (только коды растущей ширины). Номер режима записывается первым байтом
+LZ78_MODES = {"lz78": 0, "lzw": 1}
+# Наибольшая ширина кода LZW в битах: в словаре не больше 2 ** LZW_MAX_CODE_BITS фраз
+LZW_MAX_CODE_BITS = 16
+# Политики заполненного словаря LZW (см. LZWDictionary), номер пишется в заголовок
+LZW_POLICIES = {"freeze": 0, "reset": 1, "lru": 2}
+LZW_POLICY = "reset"
+
+
+# Функция для кодирования данных с помощью алгоритма LZ78
+def lz78_encode(data: bytes) -> bytes:
+    # Словарь - префиксное дерево: ключ (номер родителя << 8) | байт -> номер узла.
+    # Узел 0 - пустая строка, строка задаётся номером своего последнего узла
+    trie = {}
+    current_id = 0
+    encoded_data = bytearray()
+
+    for byte in data:
+        key = (current_id << 8) | byte
+        child_id = trie.get(key)
+        if child_id is not None:
+            current_id = child_id
+        else:
+            # Используем 4 байта для индекса
+            encoded_data.extend(current_id.to_bytes(4, 'big'))  # Индекс текущей строки
+            encoded_data.append(byte)  # Новый символ
+            trie[key] = len(trie) + 1  # Добавляем новую строку в словарь
+            current_id = 0
+
+    if current_id:
+        # Используем 4 байта для индекса
+        encoded_data.extend(current_id.to_bytes(4, 'big'))  # Индекс последней строки
+
+    return bytes(encoded_data)
+
+
+# Функция для декодирования данных с помощью алгоритма LZ78
+def lz78_decode(encoded_data: bytes) -> bytes:
+    # Токен - 4 байта индекса и новый символ, последний токен может быть без символа
+    token_count = len(encoded_data) // 5
+    tail = encoded_data[token_count * 5:]
+    if len(tail) not in (0, 4):
+        raise ValueError("Некорректная длина закодированных данных")
+    tokens = memoryview(encoded_data)[:token_count * 5]
+
+    # Первый проход: длины фраз и размер результата. Фраза k - фраза-родитель из
+    # токена k плюс его символ, фраза 0 - пустая строка
+    lengths = array('Q', bytes(8 * (token_count + 1)))
+    total = 0
+    for phrase_id, (index, byte) in enumerate(struct.iter_unpack('>IB', tokens), 1):
+        if index >= phrase_id:
+            raise ValueError("Некорректный индекс в закодированных данных")
+        lengths[phrase_id] = lengths[index] + 1
+        total += lengths[phrase_id]
+    last_index = int.from_bytes(tail, 'big') if tail else 0
+    if last_index > token_count:
+        raise ValueError("Некорректный индекс в закодированных данных")
+    total += lengths[last_index]
+
+    # Второй проход: каждая фраза уже записана в выходной буфер при создании, поэтому
+    # словарь хранит только позицию её первого вхождения, а новая фраза - срез
+    # по позиции родителя и один байт
+    decoded_data = bytearray(total)
+    output = memoryview(decoded_data)
+    positions = array('Q', bytes(8 * (token_count + 1)))
+    position = 0
+    for phrase_id, (index, byte) in enumerate(struct.iter_unpack('>IB', tokens), 1):
+        length = lengths[index]
+        start = positions[index]
+        output[position:position + length] = output[start:start + length]
+        output[position + length] = byte
+        positions[phrase_id] = position
+        position += length + 1
+    start = positions[last_index]
+    output[position:] = output[start:start + lengths[last_index]]
+
+    return bytes(decoded_data)
+
+
+# Запись чисел заданной ширины в поток бит (старшие биты первыми)
+class BitWriter():
+    def __init__(self):
+        self.buffer = bytearray()
+        self.accumulator = 0
+        self.bit_count = 0
+
+    def write(self, value: int, width: int):
+        self.accumulator = (self.accumulator << width) | value
+        self.bit_count += width
+        while self.bit_count >= 8:
+            self.bit_count -= 8
+            self.buffer.append(self.accumulator >> self.bit_count)
+            self.accumulator &= (1 << self.bit_count) - 1
+
+    # Дописывает неполный байт нулями и возвращает поток
+    def flush(self) -> bytes:
+        if self.bit_count:
+            self.buffer.append(self.accumulator << (8 - self.bit_count))
+            self.accumulator = 0
+            self.bit_count = 0
+        return bytes(self.buffer)
+
+
+# Чтение чисел заданной ширины из потока бит
+class BitReader():
+    def __init__(self, data: bytes, position: int = 0):
+        self.data = data
+        self.position = position
+        self.accumulator = 0
+        self.bit_count = 0
+
+    def bits_left(self) -> int:
+        return self.bit_count + 8 * (len(self.data) - self.position)
+
+    def read(self, width: int) -> int:
+        while self.bit_count < width:
+            self.accumulator = (self.accumulator << 8) | self.data[self.position]
+            self.position += 1
+            self.bit_count += 8
+        self.bit_count -= width
+        value = self.accumulator >> self.bit_count
+        self.accumulator &= (1 << self.bit_count) - 1
+        return value
+
+
+# Словарь LZW ограниченного размера: не больше 2 ** max_code_bits кодов. Когда он
+# заполнен, новая фраза обрабатывается по политике: freeze - словарь больше не меняется,
+# reset - словарь очищается (как в compress), lru - код новой фразы отнимается у давно
+# не использованной фразы-листа (фразы, которая не служит началом других фраз).
+# Кодер и декодер вызывают методы в одном и том же порядке, поэтому словари совпадают
+class LZWDictionary():
+    def __init__(self, max_code_bits: int, policy: str):
+        self.limit = 1 << max_code_bits
+        self.policy = policy
+        self.reset()
+
+    def reset(self):
+        self.next_code = 256
+        # Префиксное дерево кодера: (код родителя << 8) | байт -> код
+        self.trie = {}
+        # Для lru: ключ в дереве, родитель и число продолжений каждой фразы,
+        # листья в порядке использования (первый - давно не использованный)
+        self.keys = {}
+        self.parents = {}
+        self.child_counts = {}
+        self.leaves = OrderedDict()
+
+    # Ширина следующего кода: достаточна для любого кода словаря
+    def code_width(self) -> int:
+        return max(9, (self.next_code - 1).bit_length())
+
+    # Отмечает использование фразы
+    def touch(self, code: int):
+        if code in self.leaves:
+            self.leaves.move_to_end(code)
+
+    # Выделяет код для продолжения фразы parent, None - фраза не добавляется
+    def add(self, parent: int):
+        if self.next_code < self.limit:
+            code = self.next_code
+            self.next_code += 1
+        elif self.policy == "reset":
+            self.reset()
+            return None
+        elif self.policy == "lru":
+            code = self.evict(parent)
+            if code is None:
+                return None
+        else:
+            return None
+
+        if self.policy == "lru":
+            self.parents[code] = parent
+            self.child_counts[code] = 0
+            self.leaves[code] = None
+            if parent >= 256:
+                self.child_counts[parent] += 1
+                self.leaves.pop(parent, None)
+        return code
+
+    # Удаляет давно не использованный лист (кроме parent, который сейчас получит продолжение)
+    def evict(self, parent: int):
+        victim = next((code for code in self.leaves if code != parent), None)
+        if victim is None:
+            return None
+        del self.leaves[victim]
+        del self.child_counts[victim]
+        if victim in self.keys:
+            del self.trie[self.keys.pop(victim)]
+        victim_parent = self.parents.pop(victim)
+        if victim_parent >= 256:
+            self.child_counts[victim_parent] -= 1
+            if self.child_counts[victim_parent] == 0:
+                self.leaves[victim_parent] = None
+        return victim
+
+    # Записывает фразу "parent + byte" в дерево кодера
+    def bind(self, code: int, parent: int, byte: int):
+        key = (parent << 8) | byte
+        self.trie[key] = code
+        if self.policy == "lru":
+            self.keys[code] = key
+
+
+# Функция для кодирования данных с помощью алгоритма LZW: коды 0..255 - отдельные байты,
+# каждый выданный код порождает фразу "код + следующий байт". Символы в поток не пишутся,
+# а ширина кодов растёт с 9 бит вместе со словарём.
+# Заголовок: max_code_bits и номер политики словаря из LZW_POLICIES (по байту)
+def lzw_encode(data: bytes, max_code_bits: int = LZW_MAX_CODE_BITS, policy: str = LZW_POLICY) -> bytes:
+    if policy not in LZW_POLICIES:
+        raise ValueError(f"Неизвестная политика словаря: {policy}")
+    if not 9 <= max_code_bits <= 32:
+        raise ValueError("Ширина кода LZW должна быть от 9 до 32 бит")
+    writer = BitWriter()
+    writer.write(max_code_bits, 8)
+    writer.write(LZW_POLICIES[policy], 8)
+    if not data:
+        return writer.flush()
+
+    dictionary = LZWDictionary(max_code_bits, policy)
+    current_code = data[0]
+
+    for byte in memoryview(data)[1:]:
+        child_code = dictionary.trie.get((current_code << 8) | byte)
+        if child_code is not None:
+            current_code = child_code
+            continue
+        writer.write(current_code, dictionary.code_width())
+        dictionary.touch(current_code)
+        code = dictionary.add(current_code)
+        if code is not None:
+            dictionary.bind(code, current_code, byte)
+        current_code = byte
+
+    writer.write(current_code, dictionary.code_width())
+    return writer.flush()
+
+
+# Функция для декодирования данных с помощью алгоритма LZW. Как и в lz78_decode, фраза
+# хранится позицией первого вхождения в результате и длиной: новая фраза - предыдущая
+# фраза плюс первый байт текущей, то есть срез длиной на байт больше предыдущей
+def lzw_decode(encoded_data: bytes) -> bytes:
+    if len(encoded_data) < 2:
+        raise ValueError("Отсутствует заголовок LZW")
+    max_code_bits = encoded_data[0]
+    policy = next((name for name, number in LZW_POLICIES.items() if number == encoded_data[1]), None)
+    if policy is None:
+        raise ValueError("Неизвестная политика словаря в закодированных данных")
+
+    dictionary = LZWDictionary(max_code_bits, policy)
+    reader = BitReader(encoded_data, 2)
+    # Фраза с кодом c хранится под индексом c - 256
+    positions = array('Q')
+    lengths = array('Q')
+    decoded_data = bytearray()
+    previous_code = None
+    previous_start = 0
+    previous_length = 0
+
+    while True:
+        # Код для фразы "предыдущая + первый байт текущей" выделяется до чтения кода, как в кодере
+        if previous_code is not None:
+            code = dictionary.add(previous_code)
+            if code is not None:
+                if code - 256 == len(positions):
+                    positions.append(previous_start)
+                    lengths.append(previous_length + 1)
+                else:
+                    positions[code - 256] = previous_start
+                    lengths[code - 256] = previous_length + 1
+
+        width = dictionary.code_width()
+        # Оставшиеся биты (меньше ширины кода) - дополнение до байта
+        if reader.bits_left() < width:
+            break
+        code = reader.read(width)
+        dictionary.touch(code)
+
+        start = len(decoded_data)
+        if code < 256:
+            decoded_data.append(code)
+            length = 1
+        elif code < dictionary.next_code:
+            source = positions[code - 256]
+            length = lengths[code - 256]
+            if source + length <= start:
+                decoded_data += decoded_data[source:source + length]
+            else:
+                # Фраза, добавленная на этом же шаге, заканчивается первым байтом самой себя
+                decoded_data += decoded_data[source:start]
+                decoded_data.append(decoded_data[source])
+        else:
+            raise ValueError("Некорректный код в закодированных данных")
+
+        previous_code = code
+        previous_start = start
+        previous_length = length
+
+    return bytes(decoded_data)
+
+
+# Сжатие в выбранном режиме: первый байт результата - номер режима из LZ78_MODES
+def lz78_compress(data: bytes, mode: str = "lzw") -> bytes:
+    if mode == "lz78":
+        return bytes([LZ78_MODES[mode]]) + lz78_encode(data)
+    if mode == "lzw":
+        return bytes([LZ78_MODES[mode]]) + lzw_encode(data)
+    raise ValueError(f"Неизвестный режим: {mode}")
+
+
+# Распаковка: режим определяется по первому байту
+def lz78_decompress(compressed_data: bytes) -> bytes:
+    if compressed_data[:1] == bytes([LZ78_MODES["lz78"]]):
+        return lz78_decode(compressed_data[1:])
+    if compressed_data[:1] == bytes([LZ78_MODES["lzw"]]):
+        return lzw_decode(compressed_data[1:])
+    raise ValueError("Неизвестный режим в закодированных данных")
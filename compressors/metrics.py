@@ -0,0 +1,39 @@
+"""
+Характеристики данных и кодов, которые выводят сценарии сжатия.
+"""
+import math
+
+from .huffman import count_symb
+
+
+def calculate_entropy(data: bytes) -> float:
+    """
+    Вычисляет энтропию данных по формуле Шеннона.
+    """
+    counter = count_symb(data)
+    total_symbols = len(data)
+    entropy = 0.0
+
+    for count in counter:
+        if count > 0:
+            probability = count / total_symbols
+            entropy -= probability * math.log2(probability)
+
+    return entropy
+
+
+def calculate_average_code_length(huffman_codes: dict, data: bytes) -> float:
+    """
+    Вычисляет среднюю длину кода Хаффмана.
+    """
+    counter = count_symb(data)
+    total_symbols = len(data)
+    total_length = 0.0
+    if total_symbols == 0:
+        return total_length
+
+    for symbol, code in huffman_codes.items():
+        probability = counter[symbol] / total_symbols
+        total_length += probability * len(code)
+
+    return total_length
@@ -0,0 +1,86 @@
+"""
+Преобразование Move-To-Front и кодирование серий нулевых рангов на его выходе.
+"""
+import numpy as np
+
+# Кодирование серий нулевых рангов (RUNA/RUNB, как в bzip2).
+# Длина серии нулей записывается в биективной двоичной системе цифрами RUNA (1) и RUNB (2),
+# младшая цифра первой; ненулевой ранг r передаётся символом r + 1. Алфавит - 257 символов
+RUNA = 0
+RUNB = 1
+# Размер алфавита после кодирования серий: RUNA, RUNB и ранги 1..255
+ZERO_RUN_ALPHABET_SIZE = 257
+
+
+# Алфавит хранится в bytearray: поиск байта - memchr, сдвиг - memmove.
+# Внутри серий одинаковых байт ранг всегда 0, поэтому цикл идёт только по началам серий
+def mtf_transform(data: bytes) -> bytes:
+    alphabet = bytearray(range(256))
+    symbols = np.frombuffer(data, dtype=np.uint8)
+    run_starts = np.flatnonzero(np.diff(symbols, prepend=np.int16(-1)))
+    ranks = []
+    for byte in symbols[run_starts].tolist():
+        index = alphabet.index(byte)
+        ranks.append(index)
+        alphabet[1:index + 1] = alphabet[:index]
+        alphabet[0] = byte
+    transformed_data = np.zeros(len(symbols), dtype=np.uint8)
+    transformed_data[run_starts] = ranks
+    return transformed_data.tobytes()
+
+
+# Нулевой ранг повторяет предыдущий байт, поэтому цикл идёт только по ненулевым рангам,
+# а нули заполняются векторно
+def mtf_inverse(transformed_data: bytes) -> bytes:
+    alphabet = bytearray(range(256))
+    ranks = np.frombuffer(transformed_data, dtype=np.uint8)
+    nonzero = ranks != 0
+    symbols = bytearray(1)
+    symbols[0] = alphabet[0]
+    for index in ranks[nonzero].tolist():
+        byte = alphabet[index]
+        symbols.append(byte)
+        alphabet[1:index + 1] = alphabet[:index]
+        alphabet[0] = byte
+    return np.frombuffer(symbols, dtype=np.uint8)[np.cumsum(nonzero)].tobytes()
+
+
+def zero_run_encode(ranks: bytes) -> list[int]:
+    values = np.frombuffer(ranks, dtype=np.uint8)
+    nonzero = np.flatnonzero(values)
+    # Длины серий нулей перед каждым ненулевым рангом и после последнего из них
+    run_lengths = np.diff(np.concatenate(([-1], nonzero, [len(values)]))) - 1
+    symbols = (values[nonzero].astype(np.uint16) + 1).tolist()
+    symbols.append(None)
+    encoded = []
+    for run_length, symbol in zip(run_lengths.tolist(), symbols):
+        while run_length > 0:
+            if run_length & 1:
+                encoded.append(RUNA)
+                run_length = (run_length - 1) >> 1
+            else:
+                encoded.append(RUNB)
+                run_length = (run_length - 2) >> 1
+        if symbol is not None:
+            encoded.append(symbol)
+    return encoded
+
+
+def zero_run_decode(symbols: list[int]) -> bytes:
+    ranks = bytearray()
+    run_length = 0
+    weight = 1
+    for symbol in symbols:
+        if symbol <= RUNB:
+            # RUNA добавляет вес разряда, RUNB - удвоенный вес
+            run_length += weight << symbol
+            weight <<= 1
+        else:
+            if run_length:
+                ranks.extend(bytes(run_length))
+                run_length = 0
+                weight = 1
+            ranks.append(symbol - 1)
+    if run_length:
+        ranks.extend(bytes(run_length))
+    return bytes(ranks)
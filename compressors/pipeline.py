@@ -0,0 +1,337 @@
+"""
+Конвейеры сжатия, задаваемые описанием из имён стадий.
+
+Стадия - объект с методами encode(buffer) и decode(buffer): оба принимают memoryview
+и возвращают объект с буферным протоколом (bytes, bytearray, массив numpy).
+Конвейер оборачивает результат каждой стадии в memoryview и передаёт его следующей
+стадии без промежуточного копирования в bytes. Стадии регистрируются в STAGES,
+поэтому цепочку можно описать данными: ["bwt", "mtf", "zrle", "huffman"].
+"""
+import numpy as np
+
+from .bwt import BWT_CHUNK_SIZE, BWT_SAMPLES, bwt_inverse, bwt_transform, validate_samples
+from .huffman import ALPHABET_SIZE, MAX_CODE_LENGTH, huffman_decode_symbols, huffman_encode_symbols
+from .image import apply_prefilter, remove_prefilter
+from .lz77 import LZ77_BLOCK_SIZE, LZ77Decoder, LZ77Encoder
+from .lz78 import lz78_compress, lz78_decompress
+from .mtf import mtf_inverse, mtf_transform, zero_run_decode, zero_run_encode
+from .rle import rle7_compress, rle7_decompress, rle_compress, rle_decompress
+from .varint import read_varint, write_varint
+
+# Размер блока BWT по умолчанию (200 КБ, как в конвейере BWT+MTF+HA)
+BWT_BLOCK_SIZE = 200 * 1024
+# Максимальный размер блока BWT (8 МБ)
+MAX_BWT_BLOCK_SIZE = 8 * 1024 * 1024
+# Символы шире байта (выход zrle) передаются 16-битными числами в порядке little-endian
+WIDE_SYMBOL_DTYPE = np.dtype("<u2")
+
+
+class Stage:
+    """
+    Базовый класс стадии. Подклассы задают имя и переопределяют encode и decode;
+    параметры стадии передаются в конструктор.
+    """
+    name = None
+    # Стадия принимает символы шире байта (memoryview с itemsize > 1),
+    # остальным стадиям такие данные передаются как байты
+    wide_symbols = False
+
+    def encode(self, buffer: memoryview):
+        raise NotImplementedError
+
+    def decode(self, buffer: memoryview):
+        raise NotImplementedError
+
+
+class BWTStage(Stage):
+    """
+    Блочное BWT. Формат: varint(размер блока), varint(размер чанка), varint(число выборок),
+    затем для каждого блока varint(число индексов), индексы в varint и преобразованный блок.
+    """
+    name = "bwt"
+
+    def __init__(self, block_size: int = BWT_BLOCK_SIZE, chunk_size: int = BWT_CHUNK_SIZE,
+                 samples: int = BWT_SAMPLES):
+        if not 0 < block_size <= MAX_BWT_BLOCK_SIZE:
+            raise ValueError(f"Размер блока должен быть от 1 до {MAX_BWT_BLOCK_SIZE} байт")
+        if chunk_size < 0:
+            raise ValueError("Размер чанка BWT не может быть отрицательным")
+        validate_samples(samples)
+        self.block_size = block_size
+        self.chunk_size = chunk_size
+        self.samples = samples
+
+    def encode(self, buffer: memoryview) -> bytearray:
+        encoded = bytearray()
+        write_varint(encoded, self.block_size)
+        write_varint(encoded, self.chunk_size)
+        write_varint(encoded, self.samples)
+        for start in range(0, len(buffer), self.block_size):
+            transformed_data, indices = bwt_transform(buffer[start:start + self.block_size], self.chunk_size,
+                                                      self.samples)
+            write_varint(encoded, len(indices))
+            for index in indices:
+                write_varint(encoded, index)
+            encoded += transformed_data
+        return encoded
+
+    def decode(self, buffer: memoryview) -> bytearray:
+        block_size, i = read_varint(buffer, 0)
+        chunk_size, i = read_varint(buffer, i)
+        samples, i = read_varint(buffer, i)
+        decoded = bytearray()
+        while i < len(buffer):
+            num_indices, i = read_varint(buffer, i)
+            indices = []
+            for _ in range(num_indices):
+                index, i = read_varint(buffer, i)
+                indices.append(index)
+            # Все блоки, кроме последнего, имеют размер block_size
+            block = buffer[i:i + block_size]
+            decoded += bwt_inverse(block, indices, chunk_size, samples)
+            i += len(block)
+        return decoded
+
+
+class MTFStage(Stage):
+    """
+    Move-to-front: байты заменяются рангами.
+    """
+    name = "mtf"
+
+    def encode(self, buffer: memoryview) -> bytes:
+        return mtf_transform(buffer)
+
+    def decode(self, buffer: memoryview) -> bytes:
+        return mtf_inverse(buffer)
+
+
+class ZeroRunStage(Stage):
+    """
+    Серии нулевых рангов в символах RUNA/RUNB. Алфавит результата - 257 символов,
+    поэтому символы записываются 16-битными числами (WIDE_SYMBOL_DTYPE).
+    """
+    name = "zrle"
+
+    def encode(self, buffer: memoryview) -> np.ndarray:
+        return np.array(zero_run_encode(buffer), dtype=WIDE_SYMBOL_DTYPE)
+
+    def decode(self, buffer: memoryview) -> bytes:
+        if len(buffer) % WIDE_SYMBOL_DTYPE.itemsize:
+            raise ValueError("Некорректные данные: неполный 16-битный символ")
+        return zero_run_decode(np.frombuffer(buffer, dtype=WIDE_SYMBOL_DTYPE).tolist())
+
+
+class HuffmanStage(Stage):
+    """
+    Канонический код Хаффмана. Байты кодируются в алфавите из 256 символов, 16-битные
+    символы - в алфавите до наибольшего встреченного символа.
+    Формат: байт ширины символа (1 или 2), varint(размер алфавита), код Хаффмана.
+    """
+    name = "huffman"
+    wide_symbols = True
+
+    def __init__(self, max_code_length: int = MAX_CODE_LENGTH):
+        self.max_code_length = max_code_length
+
+    def encode(self, buffer: memoryview) -> bytes:
+        header = bytearray()
+        if buffer.itemsize == 1:
+            symbols = buffer
+            alphabet_size = ALPHABET_SIZE
+        else:
+            symbols = np.frombuffer(buffer, dtype=WIDE_SYMBOL_DTYPE).tolist()
+            alphabet_size = max(symbols, default=0) + 1
+        header.append(buffer.itemsize)
+        write_varint(header, alphabet_size)
+        compressed_data, _ = huffman_encode_symbols(symbols, alphabet_size, self.max_code_length)
+        return bytes(header) + compressed_data
+
+    def decode(self, buffer: memoryview):
+        if len(buffer) == 0 or buffer[0] not in (1, WIDE_SYMBOL_DTYPE.itemsize):
+            raise ValueError("Некорректные данные: неизвестная ширина символа")
+        symbol_size = buffer[0]
+        alphabet_size, i = read_varint(buffer, 1)
+        symbols = huffman_decode_symbols(buffer[i:], alphabet_size)
+        if symbol_size == 1:
+            return bytes(symbols)
+        return np.array(symbols, dtype=WIDE_SYMBOL_DTYPE)
+
+
+class RLEStage(Stage):
+    """
+    RLE с выбором режима (rle_compress): двухцветные raw-изображения - по битам,
+    остальные данные - побайтово, с необязательной фильтрацией изображений.
+    """
+    name = "rle"
+
+    def __init__(self, mode: str = "auto", prefilter: bool = False):
+        self.mode = mode
+        self.prefilter = prefilter
+
+    def encode(self, buffer: memoryview) -> bytes:
+        return rle_compress(buffer, self.mode, self.prefilter)
+
+    def decode(self, buffer: memoryview) -> bytes:
+        return rle_decompress(buffer)
+
+
+class RLE7Stage(Stage):
+    """
+    RLE с однобайтовым заголовком токена (формат конвейера BWT+RLE).
+    """
+    name = "rle7"
+
+    def encode(self, buffer: memoryview) -> bytes:
+        return rle7_compress(buffer)
+
+    def decode(self, buffer: memoryview) -> bytes:
+        return rle7_decompress(buffer)
+
+
+class PrefilterStage(Stage):
+    """
+    Фильтрация строк raw-изображений (apply_prefilter); прочие данные проходят без изменений.
+    """
+    name = "prefilter"
+
+    def encode(self, buffer: memoryview) -> bytes:
+        return apply_prefilter(buffer)
+
+    def decode(self, buffer: memoryview):
+        return remove_prefilter(buffer)
+
+
+class LZ77Stage(Stage):
+    """
+    Потоковый LZ77 (LZ77Encoder) с выбранным уровнем сжатия.
+    """
+    name = "lz77"
+
+    def __init__(self, level: str = "default", block_size: int = LZ77_BLOCK_SIZE,
+                 independent_blocks: bool = False, workers: int = 1):
+        # Параметры проверяются сразу, а не при первом кодировании
+        LZ77Encoder(level, block_size, independent_blocks, workers)
+        self.level = level
+        self.block_size = block_size
+        self.independent_blocks = independent_blocks
+        self.workers = workers
+
+    def encode(self, buffer: memoryview) -> bytes:
+        encoder = LZ77Encoder(self.level, self.block_size, self.independent_blocks, self.workers)
+        return encoder.feed(buffer) + encoder.flush()
+
+    def decode(self, buffer: memoryview) -> bytes:
+        decoder = LZ77Decoder()
+        decoded_data = decoder.feed(buffer)
+        decoder.flush()
+        return decoded_data
+
+
+class LZ78Stage(Stage):
+    """
+    LZ78 или LZW (lz78_compress) в выбранном режиме.
+    """
+    name = "lz78"
+
+    def __init__(self, mode: str = "lzw"):
+        self.mode = mode
+
+    def encode(self, buffer: memoryview) -> bytes:
+        return lz78_compress(buffer, self.mode)
+
+    def decode(self, buffer: memoryview) -> bytes:
+        return lz78_decompress(buffer)
+
+
+# Зарегистрированные стадии: имя -> класс стадии
+STAGES = {
+    stage_class.name: stage_class
+    for stage_class in (BWTStage, MTFStage, ZeroRunStage, HuffmanStage, RLEStage, RLE7Stage,
+                        PrefilterStage, LZ77Stage, LZ78Stage)
+}
+
+# Конвейеры отдельных сценариев "comp *.py", описанные стадиями
+PIPELINES = {
+    "HA": ["huffman"],
+    "RLE": ["rle"],
+    "BWT+RLE": [("bwt", {"block_size": 64 * 1024}), "rle7"],
+    "BWT+MTF+HA": ["bwt", "mtf", "zrle", "huffman"],
+    "BWT+RLE+MTF+HA": ["bwt", "rle7", "mtf", "zrle", "huffman"],
+    "LZ77": ["lz77"],
+    "LZ77+HA": ["lz77", "huffman"],
+    "LZ78": ["lz78"],
+    "LZ78+HA": ["lz78", "huffman"],
+}
+
+
+def register_stage(stage_class):
+    """
+    Добавляет класс стадии в STAGES под именем из атрибута name.
+    """
+    if not stage_class.name:
+        raise ValueError("У стадии должно быть имя")
+    if stage_class.name in STAGES:
+        raise ValueError(f"Стадия {stage_class.name} уже зарегистрирована")
+    STAGES[stage_class.name] = stage_class
+    return stage_class
+
+
+def create_stage(spec) -> Stage:
+    """
+    Создаёт стадию по описанию: имени, паре (имя, параметры) или готовому объекту стадии.
+    """
+    if isinstance(spec, Stage):
+        return spec
+    if isinstance(spec, str):
+        name, params = spec, {}
+    else:
+        name, params = spec
+    if name not in STAGES:
+        raise ValueError(f"Неизвестная стадия: {name}")
+    return STAGES[name](**params)
+
+
+class Pipeline:
+    """
+    Цепочка стадий: кодирование проходит стадии по порядку, декодирование - в обратном.
+    Описание - список имён стадий из STAGES или пар (имя, параметры),
+    например [("lz77", {"level": "max"}), "huffman"]. Строка "bwt+mtf+zrle+huffman"
+    задаёт цепочку стадий с параметрами по умолчанию.
+    """
+    def __init__(self, spec):
+        if isinstance(spec, str):
+            if spec in PIPELINES:
+                spec = PIPELINES[spec]
+            elif spec != spec.lower():
+                # Имена сценариев пишутся заглавными буквами, стадии - строчными
+                raise ValueError(f"Неизвестный конвейер: {spec}")
+            else:
+                spec = spec.split("+")
+        self.stages = [create_stage(stage_spec) for stage_spec in spec]
+        if not self.stages:
+            raise ValueError("Конвейер должен содержать хотя бы одну стадию")
+
+    @property
+    def name(self) -> str:
+        return "+".join(stage.name for stage in self.stages)
+
+    def encode(self, data) -> bytes:
+        buffer = memoryview(data)
+        for stage in self.stages:
+            buffer = memoryview(stage.encode(self.stage_input(stage, buffer)))
+        return bytes(buffer)
+
+    def decode(self, encoded_data) -> bytes:
+        buffer = memoryview(encoded_data)
+        for stage in reversed(self.stages):
+            buffer = memoryview(stage.decode(self.stage_input(stage, buffer)))
+        return bytes(buffer)
+
+    # Символы шире байта получают только стадии, которые их поддерживают; для остальных
+    # тот же буфер без копирования представляется как последовательность байтов
+    @staticmethod
+    def stage_input(stage: Stage, buffer: memoryview) -> memoryview:
+        if buffer.itemsize > 1 and not stage.wide_symbols:
+            return buffer.cast("B")
+        return buffer
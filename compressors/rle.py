@@ -0,0 +1,330 @@
+"""
+Кодирование длин серий (RLE).
+Побайтовый формат с заголовком токена (count, byte) / (0, length, символы...),
+формат с однобайтовым заголовком токена (бит 7 - признак повтора, конвейер BWT+RLE)
+и RLE по битам для двухцветных raw-изображений.
+"""
+import numpy as np
+
+from .image import RAW_IMAGE_CHANNELS, filter_image, parse_raw_header, unfilter_image
+from .varint import decode_varints, encode_varints, read_varint, varint_sizes, write_varint
+
+# Наибольшая длина серии и группы неповторяющихся символов в одном токене
+RLE_MAX_COUNT = 255
+# Наибольшая длина серии и неповторяющейся последовательности в токене с однобайтовым заголовком (7 бит)
+RLE7_MAX_COUNT = 127
+# Режимы сжатия: побайтовый RLE и RLE по битам для двухцветных изображений.
+# Номер режима записывается первым байтом
+RLE_MODES = {"bytes": 0, "bits": 1}
+# Номер режима bytes для отфильтрованного изображения (prefilter): признак фильтрации
+# хранится в байте режима, без фильтрации формат не меняется
+RLE_FILTERED_MODE = 2
+
+
+def find_runs(arr: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Находит серии одинаковых байтов и возвращает их значения и длины.
+    """
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(arr)) + 1))
+    lengths = np.diff(np.append(starts, len(arr)))
+    return arr[starts], lengths
+
+
+def improved_rle_compress(data: bytes) -> bytes:
+    """
+    Сжимает данные с использованием улучшенного алгоритма RLE.
+    Повтор кодируется токеном (count, byte), неповторяющиеся символы - токеном
+    (0, length, символы...). Серии находятся векторно, токены записываются сразу для всех серий.
+    """
+    arr = np.frombuffer(data, dtype=np.uint8)
+    if len(arr) == 0:
+        return b""
+    values, lengths = find_runs(arr)
+
+    # Серия делится на токены повтора по RLE_MAX_COUNT байт; остаток в один байт
+    # становится неповторяющимся символом
+    full, rest = np.divmod(lengths, RLE_MAX_COUNT)
+    run_tokens = full + (rest > 1)
+    literal = rest == 1
+
+    # Неповторяющиеся символы подряд идущих серий образуют группу. Группу прерывает
+    # токен повтора, а в токены она делится по RLE_MAX_COUNT символов
+    previous_literal = np.concatenate(([False], literal[:-1]))
+    group_start = literal & ((run_tokens > 0) | ~previous_literal)
+    group_id = np.cumsum(group_start) - 1
+    literal_index = np.cumsum(literal) - 1
+    position = literal_index - np.maximum.accumulate(np.where(group_start, literal_index, -1))
+    header = literal & (position % RLE_MAX_COUNT == 0)
+
+    # Размер кода каждой серии и его начало в выходном массиве
+    sizes = 2 * run_tokens + literal + 2 * header
+    ends = np.cumsum(sizes)
+    begins = ends - sizes
+    compressed = np.empty(ends[-1], dtype=np.uint8)
+
+    # Токены повтора: (RLE_MAX_COUNT, byte) для полных частей серии, затем (остаток, byte)
+    token_runs = np.repeat(np.arange(len(values)), run_tokens)
+    token_numbers = np.arange(len(token_runs)) - np.repeat(np.cumsum(run_tokens) - run_tokens, run_tokens)
+    token_positions = begins[token_runs] + 2 * token_numbers
+    compressed[token_positions] = np.where(token_numbers < full[token_runs], RLE_MAX_COUNT, rest[token_runs])
+    compressed[token_positions + 1] = values[token_runs]
+
+    # Неповторяющиеся символы идут после токенов повтора своей серии,
+    # в начале каждого токена группы - заголовок (0, length)
+    literal_runs = np.flatnonzero(literal)
+    literal_positions = begins[literal_runs] + 2 * run_tokens[literal_runs] + 2 * header[literal_runs]
+    compressed[literal_positions] = values[literal_runs]
+    header_runs = literal_runs[header[literal_runs]]
+    header_positions = begins[header_runs] + 2 * run_tokens[header_runs]
+    group_sizes = np.bincount(group_id[literal_runs])
+    remaining = group_sizes[group_id[header_runs]] - position[header_runs]
+    compressed[header_positions] = 0
+    compressed[header_positions + 1] = np.minimum(remaining, RLE_MAX_COUNT)
+
+    return compressed.tobytes()
+
+
+def improved_rle_decompress(compressed_data: bytes) -> bytes:
+    """
+    Декомпрессия данных, сжатых с использованием улучшенного RLE.
+    Проход по заголовкам находит начала токенов, по ним векторно определяется,
+    сколько раз повторить каждый байт кода, и результат собирается через np.repeat.
+    """
+    n = len(compressed_data)
+    token_starts = []
+    i = 0
+    while i < n - 1:
+        token_starts.append(i)
+        # Флаг 0 - неповторяющаяся последовательность из compressed_data[i + 1] символов,
+        # иначе - повтор из двух байт
+        i += 2 if compressed_data[i] else 2 + compressed_data[i + 1]
+    if i != n:
+        raise ValueError("Некорректные данные RLE: токен обрывается")
+
+    code = np.frombuffer(compressed_data, dtype=np.uint8)
+    token_starts = np.array(token_starts, dtype=np.int64)
+    flags = code[token_starts]
+    run_starts = token_starts[flags != 0]
+    literal_starts = token_starts[flags == 0] + 2
+
+    # Байты неповторяющихся последовательностей копируются по одному разу
+    # (разностный массив по их границам), байт повтора - count раз, заголовки - ни разу
+    delta = np.zeros(n + 1, dtype=np.int64)
+    delta[literal_starts] += 1
+    delta[literal_starts + code[literal_starts - 1]] -= 1
+    counts = np.cumsum(delta[:n])
+    counts[run_starts + 1] = code[run_starts]
+    return np.repeat(code, counts).tobytes()
+
+
+def rle7_compress(data: bytes) -> bytes:
+    """
+    RLE с заголовком токена в один байт: 0x80 | count, затем байт для повтора,
+    length, затем символы для неповторяющейся последовательности.
+    Серии находятся векторно, токены записываются сразу для всех серий.
+    """
+    arr = np.frombuffer(data, dtype=np.uint8)
+    if len(arr) == 0:
+        return b""
+    values, lengths = find_runs(arr)
+
+    # Серия делится на токены повтора по RLE7_MAX_COUNT байт; остаток в один байт
+    # становится неповторяющимся символом
+    full, rest = np.divmod(lengths, RLE7_MAX_COUNT)
+    run_tokens = full + (rest > 1)
+    literal = rest == 1
+
+    # Неповторяющиеся символы подряд идущих серий образуют последовательность. Её прерывает
+    # токен повтора, а в токены она делится по RLE7_MAX_COUNT символов
+    previous_literal = np.concatenate(([False], literal[:-1]))
+    group_start = literal & ((run_tokens > 0) | ~previous_literal)
+    group_id = np.cumsum(group_start) - 1
+    literal_index = np.cumsum(literal) - 1
+    position = literal_index - np.maximum.accumulate(np.where(group_start, literal_index, -1))
+    header = literal & (position % RLE7_MAX_COUNT == 0)
+
+    # Размер кода каждой серии и его начало в выходном массиве
+    sizes = 2 * run_tokens + literal + header
+    ends = np.cumsum(sizes)
+    begins = ends - sizes
+    compressed = np.empty(ends[-1], dtype=np.uint8)
+
+    # Токены повтора: полные части серии по RLE7_MAX_COUNT, затем остаток
+    token_runs = np.repeat(np.arange(len(values)), run_tokens)
+    token_numbers = np.arange(len(token_runs)) - np.repeat(np.cumsum(run_tokens) - run_tokens, run_tokens)
+    token_positions = begins[token_runs] + 2 * token_numbers
+    compressed[token_positions] = 0x80 | np.where(token_numbers < full[token_runs], RLE7_MAX_COUNT, rest[token_runs])
+    compressed[token_positions + 1] = values[token_runs]
+
+    # Неповторяющиеся символы идут после токенов повтора своей серии,
+    # в начале каждого токена последовательности - заголовок length
+    literal_runs = np.flatnonzero(literal)
+    literal_positions = begins[literal_runs] + 2 * run_tokens[literal_runs] + header[literal_runs]
+    compressed[literal_positions] = values[literal_runs]
+    header_runs = literal_runs[header[literal_runs]]
+    header_positions = begins[header_runs] + 2 * run_tokens[header_runs]
+    group_sizes = np.bincount(group_id[literal_runs])
+    remaining = group_sizes[group_id[header_runs]] - position[header_runs]
+    compressed[header_positions] = np.minimum(remaining, RLE7_MAX_COUNT)
+
+    return compressed.tobytes()
+
+
+def rle7_decompress(compressed_data: bytes) -> bytes:
+    """
+    Декомпрессия RLE с однобайтовым заголовком токена.
+    Проход по заголовкам находит начала токенов, по ним векторно определяется,
+    сколько раз повторить каждый байт кода, и результат собирается через np.repeat.
+    """
+    n = len(compressed_data)
+    token_starts = []
+    i = 0
+    while i < n:
+        token_starts.append(i)
+        header = compressed_data[i]
+        # Бит 7 = 1 - повтор из двух байт, иначе header неповторяющихся символов
+        i += 2 if header & 0x80 else 1 + header
+    if i != n:
+        raise ValueError("Некорректные данные RLE: токен обрывается")
+
+    code = np.frombuffer(compressed_data, dtype=np.uint8)
+    token_starts = np.array(token_starts, dtype=np.int64)
+    headers = code[token_starts]
+    repeat = headers & 0x80 != 0
+    run_starts = token_starts[repeat]
+    literal_starts = token_starts[~repeat] + 1
+
+    # Байты неповторяющихся последовательностей копируются по одному разу
+    # (разностный массив по их границам), байт повтора - count раз, заголовки - ни разу
+    delta = np.zeros(n + 1, dtype=np.int64)
+    delta[literal_starts] += 1
+    delta[literal_starts + headers[~repeat]] -= 1
+    counts = np.cumsum(delta[:n])
+    counts[run_starts + 1] = headers[repeat] & 0x7F
+    return np.repeat(code, counts).tobytes()
+
+
+def bit_rle_compress(data: bytes) -> bytes | None:
+    """
+    RLE по битам для двухцветного raw-изображения (байт на пиксель, не больше двух значений).
+    Строка кодируется длинами серий битов в varint, начиная с серии нулей (возможно,
+    пустой), либо упакованными битами (np.packbits), если так не длиннее.
+    Формат: varint(длина заголовка), заголовок, два значения пикселей, битовая карта
+    упакованных строк, varint(длина серий), серии, упакованные строки.
+    Возвращает None, если данные не являются двухцветным изображением.
+    """
+    raw_header = parse_raw_header(data)
+    if raw_header is None:
+        return None
+    kind, width, height, offset = raw_header
+    if RAW_IMAGE_CHANNELS[kind] != 1 or width * height != len(data) - offset or height == 0:
+        return None
+    pixels = np.frombuffer(data, dtype=np.uint8, offset=offset)
+    colors = np.flatnonzero(np.bincount(pixels, minlength=256))
+    if len(colors) > 2:
+        return None
+    low, high = colors[0], colors[-1]
+    bits = pixels == high
+
+    # Серии битов, не переходящие через границу строки
+    change = np.empty(len(bits), dtype=bool)
+    change[0] = True
+    change[1:] = bits[1:] != bits[:-1]
+    change[::width] = True
+    starts = np.flatnonzero(change)
+    lengths = np.diff(np.append(starts, len(bits)))
+    rows = starts // width
+    # Строка, начинающаяся с единиц, получает пустую первую серию нулей
+    leading_ones = np.flatnonzero((starts % width == 0) & bits[starts])
+    lengths = np.insert(lengths, leading_ones, 0)
+    rows = np.insert(rows, leading_ones, rows[leading_ones])
+
+    # Строка хранится упакованными битами, если её серии занимают не меньше места
+    row_bytes = (width + 7) // 8
+    packed_rows = np.bincount(rows, weights=varint_sizes(lengths), minlength=height) >= row_bytes
+    runs = encode_varints(lengths[~packed_rows[rows]])
+
+    compressed = bytearray()
+    write_varint(compressed, offset)
+    compressed += data[:offset]
+    compressed += bytes([low, high])
+    compressed += np.packbits(packed_rows).tobytes()
+    write_varint(compressed, len(runs))
+    compressed += runs.tobytes()
+    compressed += np.packbits(bits.reshape(height, width)[packed_rows], axis=1).tobytes()
+    return bytes(compressed)
+
+
+def bit_rle_decompress(compressed_data: bytes) -> bytes:
+    """
+    Декомпрессия RLE по битам: серии разворачиваются через np.repeat,
+    упакованные строки - через np.unpackbits, затем биты заменяются значениями пикселей.
+    """
+    offset, i = read_varint(compressed_data, 0)
+    raw_header = compressed_data[i:i + offset]
+    header_info = parse_raw_header(raw_header)
+    if header_info is None:
+        raise ValueError("Некорректные данные RLE: нет заголовка изображения")
+    _, width, height, _ = header_info
+    i += offset
+    low, high = compressed_data[i:i + 2]
+    i += 2
+
+    code = np.frombuffer(compressed_data, dtype=np.uint8)
+    flags_size = (height + 7) // 8
+    packed_rows = np.unpackbits(code[i:i + flags_size], count=height).astype(bool)
+    i += flags_size
+    runs_size, i = read_varint(compressed_data, i)
+    lengths = decode_varints(code[i:i + runs_size])
+    i += runs_size
+    row_bytes = (width + 7) // 8
+    packed_count = int(packed_rows.sum())
+    if i + packed_count * row_bytes != len(code) or lengths.sum() != (height - packed_count) * width:
+        raise ValueError("Некорректные данные RLE: размер не соответствует изображению")
+
+    # Серия начинает строку, если предыдущие серии заполнили целое число строк,
+    # а предыдущая серия не пустая (пустой бывает только первая серия строки).
+    # Серии строки чередуются, начиная с нулей
+    numbers = np.arange(len(lengths))
+    row_start = ((np.cumsum(lengths) - lengths) % width == 0) & np.concatenate(([True], lengths[:-1] > 0))
+    run_bits = (numbers - np.maximum.accumulate(np.where(row_start, numbers, 0))) % 2 == 1
+
+    bits = np.empty((height, width), dtype=bool)
+    bits[~packed_rows] = np.repeat(run_bits, lengths).reshape(-1, width)
+    packed = code[i:].reshape(packed_count, row_bytes)
+    bits[packed_rows] = np.unpackbits(packed, axis=1, count=width).astype(bool)
+    pixels = np.where(bits, np.uint8(high), np.uint8(low))
+    return bytes(raw_header) + pixels.tobytes()
+
+
+def rle_compress(data: bytes, mode: str = "auto", prefilter: bool = False) -> bytes:
+    """
+    Сжимает данные RLE в выбранном режиме, первым байтом записывается номер режима.
+    В режиме auto двухцветные raw-изображения сжимаются по битам, остальные данные - побайтово.
+    При prefilter изображение перед побайтовым RLE фильтруется (filter_image).
+    """
+    if mode not in RLE_MODES and mode != "auto":
+        raise ValueError(f"Неизвестный режим: {mode}")
+    if mode != "bytes":
+        compressed = bit_rle_compress(data)
+        if compressed is not None:
+            return bytes([RLE_MODES["bits"]]) + compressed
+        if mode == "bits":
+            raise ValueError("Режим bits применим только к двухцветным raw-изображениям")
+    filtered_data = filter_image(data) if prefilter else None
+    if filtered_data is not None:
+        return bytes([RLE_FILTERED_MODE]) + improved_rle_compress(filtered_data)
+    return bytes([RLE_MODES["bytes"]]) + improved_rle_compress(data)
+
+
+def rle_decompress(compressed_data: bytes) -> bytes:
+    """
+    Декомпрессия RLE: режим определяется по первому байту.
+    """
+    if compressed_data[:1] == bytes([RLE_MODES["bytes"]]):
+        return improved_rle_decompress(compressed_data[1:])
+    if compressed_data[:1] == bytes([RLE_FILTERED_MODE]):
+        return unfilter_image(improved_rle_decompress(compressed_data[1:]))
+    if compressed_data[:1] == bytes([RLE_MODES["bits"]]):
+        return bit_rle_decompress(compressed_data[1:])
+    raise ValueError("Неизвестный режим в закодированных данных")
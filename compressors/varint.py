@@ -0,0 +1,95 @@
+"""
+Числа переменной длины (varint): по 7 бит в байте, младшие биты первыми,
+старший бит байта - признак продолжения.
+"""
+import numpy as np
+
+
+def write_varint(encoded_data: bytearray, value: int):
+    """
+    Записывает число в формате varint.
+    """
+    while value >= 0x80:
+        encoded_data.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded_data.append(value)
+
+
+def read_varint(encoded_data: bytes, i: int) -> tuple[int, int]:
+    """
+    Читает varint с позиции i, возвращает число и позицию за ним.
+    """
+    value = 0
+    shift = 0
+    while True:
+        if i >= len(encoded_data):
+            raise ValueError("Некорректные данные: varint обрывается")
+        byte = encoded_data[i]
+        i += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, i
+        shift += 7
+
+
+def varint_complete(encoded_data: bytes, i: int) -> bool:
+    """
+    Проверяет, что varint с позиции i получен полностью (для потокового чтения).
+    """
+    while i < len(encoded_data):
+        if encoded_data[i] < 0x80:
+            return True
+        i += 1
+    return False
+
+
+def varint_size(value: int) -> int:
+    """
+    Число байт varint.
+    """
+    return max(1, (value.bit_length() + 6) // 7)
+
+
+def varint_sizes(values: np.ndarray) -> np.ndarray:
+    """
+    Число байт varint для каждого числа массива: по одному на каждые 7 значащих бит.
+    """
+    sizes = np.ones(len(values), dtype=np.int64)
+    rest = values.astype(np.int64) >> 7
+    while rest.any():
+        sizes += rest > 0
+        rest >>= 7
+    return sizes
+
+
+def encode_varints(values: np.ndarray) -> np.ndarray:
+    """
+    Записывает массив неотрицательных чисел подряд в формате varint.
+    """
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.uint8)
+    values = values.astype(np.int64)
+    sizes = varint_sizes(values)
+    ends = np.cumsum(sizes)
+    begins = ends - sizes
+    encoded = np.empty(ends[-1], dtype=np.uint8)
+    for k in range(sizes.max()):
+        present = sizes > k
+        continued = sizes[present] > k + 1
+        encoded[begins[present] + k] = ((values[present] >> (7 * k)) & 0x7F) | (continued << 7)
+    return encoded
+
+
+def decode_varints(encoded: np.ndarray) -> np.ndarray:
+    """
+    Читает все числа из последовательности varint.
+    """
+    if len(encoded) == 0:
+        return np.zeros(0, dtype=np.int64)
+    ends = np.flatnonzero(encoded < 0x80)
+    if len(ends) == 0 or ends[-1] != len(encoded) - 1:
+        raise ValueError("Некорректные данные: varint обрывается")
+    begins = np.concatenate(([0], ends[:-1] + 1))
+    # Сдвиг каждого байта - 7 бит на его номер внутри своего числа
+    shifts = 7 * (np.arange(len(encoded)) - np.repeat(begins, ends - begins + 1))
+    return np.add.reduceat((encoded & 0x7F).astype(np.int64) << shifts, begins)
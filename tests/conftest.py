@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# Тесты запускаются из корня репозитория: пакет compressors импортируется оттуда же
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# Файлы, на которых проверяются сценарии сжатия
+FILES_DIR = os.path.join(ROOT_DIR, "files to compress")
+
+
+def read_sample(file_name: str) -> bytes:
+    with open(os.path.join(FILES_DIR, file_name), "rb") as f:
+        return f.read()
+
+
+@pytest.fixture(scope="session")
+def text_data() -> bytes:
+    return read_sample("text.txt")
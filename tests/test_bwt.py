@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from compressors.bwt import (SAMPLED_INVERSE_MIN_CHAIN_LENGTH, SAMPLED_INVERSE_MIN_SAMPLES, bwt_inverse,
+                             bwt_transform, cyclic_suffix_array, reverse_transform_chunk, transform_chunk)
+
+EDGE_CASES = [b"", b"a", b"aaaa", b"banana", b"ab" * 700, bytes(range(256)) * 5]
+
+
+@pytest.mark.parametrize("data", [b"a", b"banana", b"abab", b"mississippi", bytes(50)])
+def test_suffix_array_sorts_rotations(data):
+    # Для совпадающих сдвигов порядок не определён, поэтому сравниваются сами сдвиги
+    rotations = [data[i:] + data[:i] for i in range(len(data))]
+    order = cyclic_suffix_array(data)
+    assert [rotations[i] for i in order] == sorted(rotations)
+    assert sorted(order.tolist()) == list(range(len(data)))
+
+
+@pytest.mark.parametrize("data", EDGE_CASES)
+@pytest.mark.parametrize("chunk_size", [0, 1, 100, 1024])
+@pytest.mark.parametrize("samples", [0, SAMPLED_INVERSE_MIN_SAMPLES, 63])
+def test_round_trip(data, chunk_size, samples):
+    transformed, indices = bwt_transform(data, chunk_size, samples)
+    assert len(transformed) == len(data)
+    assert bwt_inverse(transformed, indices, chunk_size, samples) == data
+
+
+@pytest.mark.parametrize("samples", [SAMPLED_INVERSE_MIN_SAMPLES, 63])
+def test_sampled_inverse_matches_text(text_data, samples):
+    transformed, indices = bwt_transform(text_data, 50000, samples)
+    # Все чанки длиннее (samples + 1) цепочек: у каждого основной индекс и samples выборок
+    chunks = -(-len(text_data) // 50000)
+    assert len(indices) == chunks * (samples + 1)
+    assert bwt_inverse(transformed, indices, 50000, samples) == text_data
+
+
+def test_sampled_and_simple_pass_agree(text_data):
+    chunk = text_data[:20000]
+    original_index, encoded_chunk, sample_rows = transform_chunk(chunk, 63)
+    assert reverse_transform_chunk(original_index, encoded_chunk, sample_rows) == chunk
+    assert reverse_transform_chunk(original_index, encoded_chunk) == chunk
+
+
+def test_short_chunks_have_no_samples():
+    samples = SAMPLED_INVERSE_MIN_SAMPLES
+    min_length = (samples + 1) * SAMPLED_INVERSE_MIN_CHAIN_LENGTH
+    data = np.random.default_rng(1).integers(0, 4, min_length + 10, dtype=np.uint8).tobytes()
+    # Первый чанк получает выборки, короткий последний - только основной индекс
+    transformed, indices = bwt_transform(data, min_length, samples)
+    assert len(indices) == samples + 2
+    assert bwt_inverse(transformed, indices, min_length, samples) == data
+    transformed, indices = bwt_transform(data[:min_length - 1], 0, samples)
+    assert len(indices) == 1
+
+
+@pytest.mark.parametrize("samples", [-1, 1, SAMPLED_INVERSE_MIN_SAMPLES - 1])
+def test_rejects_ignored_samples(samples):
+    with pytest.raises(ValueError):
+        bwt_transform(b"banana", 0, samples)
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from compressors.huffman import (CODE_LENGTH_LIMIT, MAX_CODE_LENGTH, huffman_compress, huffman_decode_symbols,
+                                 huffman_decompress, huffman_encode_symbols, limit_code_lengths, pack_bits,
+                                 serialize_code_lengths)
+from compressors.mtf import ZERO_RUN_ALPHABET_SIZE
+
+
+# Частоты Фибоначчи дают самое глубокое дерево Хаффмана: длина кода доходит до числа символов - 1
+def fibonacci_data(count: int) -> bytes:
+    frequencies = [1, 1]
+    while len(frequencies) < count:
+        frequencies.append(frequencies[-1] + frequencies[-2])
+    return b"".join(bytes([symbol]) * frequency for symbol, frequency in enumerate(frequencies))
+
+
+def is_prefix_free(codes: dict) -> bool:
+    ordered = sorted(codes.values())
+    return all(not following.startswith(code) for code, following in zip(ordered, ordered[1:]))
+
+
+@pytest.mark.parametrize("data", [b"", b"a", b"aaaa", b"ab", bytes(range(256)), fibonacci_data(22)])
+@pytest.mark.parametrize("max_code_length", [8, 12, MAX_CODE_LENGTH])
+def test_round_trip(data, max_code_length):
+    compressed, _ = huffman_compress(data, max_code_length)
+    assert huffman_decompress(compressed) == data
+
+
+def test_empty_input_gives_empty_stream():
+    assert huffman_compress(b"") == (b"", {})
+
+
+@pytest.mark.parametrize("max_code_length", [5, 8, 10, MAX_CODE_LENGTH])
+def test_code_lengths_are_limited(max_code_length):
+    data = fibonacci_data(22)
+    compressed, codes = huffman_compress(data, max_code_length)
+    assert max(len(code) for code in codes.values()) == max_code_length
+    # Неравенство Крафта и префиксность: ограниченные коды остаются однозначными
+    assert sum(2.0 ** -len(code) for code in codes.values()) <= 1
+    assert is_prefix_free(codes)
+    assert huffman_decompress(compressed) == data
+
+
+def test_unlimited_lengths_are_kept():
+    lengths = {symbol: length for symbol, length in enumerate([1, 2, 3, 3])}
+    assert limit_code_lengths(lengths, 3) == lengths
+
+
+def test_too_many_symbols_for_limit():
+    with pytest.raises(ValueError):
+        limit_code_lengths({symbol: 9 for symbol in range(300)}, 8)
+
+
+@pytest.mark.parametrize("max_code_length", [0, CODE_LENGTH_LIMIT + 1])
+def test_rejects_max_code_length(max_code_length):
+    with pytest.raises(ValueError):
+        huffman_compress(b"abc", max_code_length)
+
+
+def test_stream_never_starts_with_ff():
+    # Первый байт потока - длина кода или 0, поэтому признак фильтрации 0xFF однозначен
+    for data in (b"\xff", bytes(range(256)), fibonacci_data(22)):
+        compressed, _ = huffman_compress(data, CODE_LENGTH_LIMIT)
+        assert compressed[0] != 0xFF
+
+
+@pytest.mark.parametrize("size", range(1, 17))
+def test_padding_is_below_one_byte(size):
+    data = b"ab" * size
+    compressed, codes = huffman_compress(data)
+    packed, padding = pack_bits(data, codes)
+    assert 0 <= padding < 8
+    assert len(packed) == -(-len(data) // 8)
+    assert len(compressed) == len(serialize_code_lengths(codes)) + 1 + len(packed)
+    assert huffman_decompress(compressed) == data
+
+
+def test_wide_alphabet_round_trip():
+    symbols = np.random.default_rng(2).integers(0, ZERO_RUN_ALPHABET_SIZE, 5000).tolist()
+    compressed, codes = huffman_encode_symbols(symbols, ZERO_RUN_ALPHABET_SIZE)
+    assert max(codes) < ZERO_RUN_ALPHABET_SIZE
+    assert huffman_decode_symbols(compressed, ZERO_RUN_ALPHABET_SIZE) == symbols
+
+
+def test_text_round_trip(text_data):
+    compressed, _ = huffman_compress(text_data)
+    assert len(compressed) < len(text_data)
+    assert huffman_decompress(compressed) == text_data
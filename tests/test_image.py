@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from compressors.image import (IMAGE_FILTERS, apply_prefilter, filter_image, parse_raw_header, remove_prefilter,
+                               unfilter_image)
+from compressors.rle import RLE_FILTERED_MODE, rle_compress, rle_decompress
+from conftest import read_sample
+
+
+def raw_image(kind: str, width: int, height: int, pixels: np.ndarray) -> bytes:
+    return f"{kind},{width},{height}\n".encode("ascii") + pixels.astype(np.uint8).tobytes()
+
+
+def image_cases() -> list[bytes]:
+    rng = np.random.default_rng(7)
+    # Градиенты выбирают фильтры sub, up и average/paeth, шум - фильтр none
+    y, x = np.mgrid[0:24, 0:31]
+    gradient = np.stack([x * 5, y * 7, (x + y) * 3], axis=2) % 256
+    return [raw_image("gray", 1, 1, np.array([200])), raw_image("gray", 17, 1, rng.integers(0, 256, 17)),
+            raw_image("gray", 1, 9, np.arange(9) * 30), raw_image("gray", 31, 24, gradient[:, :, 0]),
+            raw_image("color", 31, 24, gradient), raw_image("color", 8, 5, rng.integers(0, 256, 120)),
+            read_sample("gray_image.raw")]
+
+
+def test_parse_raw_header():
+    assert parse_raw_header(b"gray,3,2\nabcdef") == ("gray", 3, 2, 9)
+    assert parse_raw_header(memoryview(b"color,1,1\nabc")) == ("color", 1, 1, 10)
+    for data in (b"", b"text without header", b"gray,3\nabc", b"cmyk,1,1\nabcd", b"gray,0,1\n", b"gray,a,1\n"):
+        assert parse_raw_header(data) is None
+
+
+@pytest.mark.parametrize("data", image_cases())
+def test_filter_round_trip(data):
+    filtered = filter_image(data)
+    assert filtered is not None
+    assert unfilter_image(filtered) == data
+
+
+def test_gradient_uses_prediction_filters():
+    filtered = filter_image(image_cases()[4])
+    _, width, height, offset = parse_raw_header(filtered)
+    rows = np.frombuffer(filtered, dtype=np.uint8, offset=offset).reshape(3, height, width + 1)
+    assert set(rows[:, :, 0].flatten().tolist()) - {IMAGE_FILTERS["none"]}
+
+
+@pytest.mark.parametrize("data", [b"", b"abc", read_sample("bw_image.raw"), b"gray,2,2\nabc", b"gray,2,0\n"])
+def test_filter_skips_other_data(data):
+    assert filter_image(data) is None
+
+
+@pytest.mark.parametrize("filtered", [b"abc", b"gray,2,1\n\x00a", b"gray,2,1\n\x09ab"])
+def test_unfilter_rejects_broken_data(filtered):
+    with pytest.raises(ValueError):
+        unfilter_image(filtered)
+
+
+@pytest.mark.parametrize("data", [b"", b"a", read_sample("color_image.raw"), read_sample("bw_image.raw")])
+@pytest.mark.parametrize("prefilter", [False, True])
+def test_prefilter_stage_round_trip(data, prefilter):
+    staged = apply_prefilter(data, prefilter)
+    assert staged[0] == int(prefilter and filter_image(data) is not None)
+    assert remove_prefilter(staged) == data
+
+
+def test_prefilter_rejects_unknown_flag():
+    with pytest.raises(ValueError):
+        remove_prefilter(b"\x02abc")
+    with pytest.raises(ValueError):
+        remove_prefilter(b"")
+
+
+def test_rle_prefilter_mode():
+    data = image_cases()[4]
+    compressed = rle_compress(data, prefilter=True)
+    assert compressed[0] == RLE_FILTERED_MODE
+    assert rle_decompress(compressed) == data
+    # Данные, не являющиеся изображением, сжимаются без фильтрации
+    assert rle_decompress(rle_compress(b"abc", prefilter=True)) == b"abc"
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from compressors.lz77 import LZ77_LEVELS, LZ77Decoder, LZ77Encoder, lz77_decode, lz77_encode
+
+EDGE_CASES = [b"", b"a", b"aaaa", b"abcabcabcabc", bytes(range(256)) * 3]
+
+
+def mixed_data(size: int) -> bytes:
+    # Повторы разной длины вперемешку со случайными байтами
+    rng = np.random.default_rng(4)
+    parts = []
+    while sum(map(len, parts)) < size:
+        part = rng.integers(0, 256, int(rng.integers(1, 50)), dtype=np.uint8).tobytes()
+        parts.append(part * int(rng.integers(1, 20)))
+    return b"".join(parts)[:size]
+
+
+def stream_encode(data: bytes, chunk_size: int, **options) -> bytes:
+    encoder = LZ77Encoder(**options)
+    encoded = bytearray()
+    for start in range(0, len(data), chunk_size):
+        encoded += encoder.feed(data[start:start + chunk_size])
+    encoded += encoder.flush()
+    return bytes(encoded)
+
+
+def stream_decode(encoded: bytes, chunk_size: int) -> bytes:
+    decoder = LZ77Decoder()
+    decoded = bytearray()
+    for start in range(0, len(encoded), chunk_size):
+        decoded += decoder.feed(encoded[start:start + chunk_size])
+    decoded += decoder.flush()
+    return bytes(decoded)
+
+
+@pytest.mark.parametrize("data", EDGE_CASES)
+@pytest.mark.parametrize("level", list(LZ77_LEVELS))
+def test_round_trip(data, level):
+    assert lz77_decode(lz77_encode(data, **LZ77_LEVELS[level])) == data
+
+
+@pytest.mark.parametrize("level", list(LZ77_LEVELS))
+def test_round_trip_text(level, text_data):
+    encoded = lz77_encode(text_data, **LZ77_LEVELS[level])
+    assert len(encoded) < len(text_data)
+    assert lz77_decode(encoded) == text_data
+
+
+def test_history_is_not_encoded():
+    data = mixed_data(20000)
+    encoded = lz77_encode(data, 1 << 16, start=10000)
+    assert lz77_decode(encoded, data[:10000]) == data[10000:]
+
+
+@pytest.mark.parametrize("data", EDGE_CASES)
+def test_stream_edge_cases(data):
+    assert stream_decode(stream_encode(data, 7, block_size=5), 3) == data
+
+
+@pytest.mark.parametrize("independent_blocks", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 999, 4096, 100000])
+def test_stream_multiple_blocks(independent_blocks, chunk_size):
+    data = mixed_data(60000)
+    encoded = stream_encode(data, chunk_size, level="fast", block_size=8000, independent_blocks=independent_blocks)
+    assert stream_decode(encoded, 1 if chunk_size == 1 else 777) == data
+
+
+def test_stream_window_spans_blocks():
+    # Окно из предыдущих блоков позволяет сослаться на повтор из другого блока
+    data = mixed_data(8000) * 2
+    shared = stream_encode(data, 4096, level="fast", block_size=8000)
+    independent = stream_encode(data, 4096, level="fast", block_size=8000, independent_blocks=True)
+    assert len(shared) < len(independent)
+    assert stream_decode(shared, 1000) == data
+    assert stream_decode(independent, 1000) == data
+
+
+def test_stream_matches_whole_encoding_for_one_block(text_data):
+    encoded = stream_encode(text_data, 1000, level="fast", block_size=len(text_data))
+    assert stream_decode(encoded, 1 << 20) == text_data
+    assert lz77_encode(text_data, **LZ77_LEVELS["fast"]) in encoded
+
+
+def test_truncated_stream():
+    encoded = stream_encode(mixed_data(20000), 4096, level="fast", block_size=8000)
+    decoder = LZ77Decoder()
+    decoder.feed(encoded[:-1])
+    with pytest.raises(ValueError):
+        decoder.flush()
+    with pytest.raises(ValueError):
+        LZ77Decoder().flush()
+
+
+def test_rejects_bad_options():
+    with pytest.raises(ValueError):
+        LZ77Encoder(level="ultra")
+    with pytest.raises(ValueError):
+        LZ77Encoder(block_size=0)
+
+
+@pytest.mark.parametrize("independent_blocks", [False, True])
+def test_parallel_matches_sequential(independent_blocks):
+    # Параллельный кодер даёт тот же код, что и последовательный, в том числе при неполной пачке блоков
+    data = mixed_data(50000)
+    options = {"level": "fast", "block_size": 6000, "independent_blocks": independent_blocks}
+    sequential = stream_encode(data, 7000, **options)
+    parallel = stream_encode(data, 7000, workers=3, **options)
+    assert parallel == sequential
+    assert stream_decode(parallel, 5000) == data
+
+
+@pytest.mark.parametrize("data", [b"", b"a", b"abcabcabc"])
+def test_parallel_edge_cases(data):
+    assert stream_decode(stream_encode(data, 4, block_size=2, workers=2), 3) == data
+
+
+def test_rejects_no_workers():
+    with pytest.raises(ValueError):
+        LZ77Encoder(workers=0)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from compressors.lz78 import (LZ78_MODES, LZW_POLICIES, lz78_compress, lz78_decode, lz78_decompress, lz78_encode,
+                              lzw_decode, lzw_encode)
+
+EDGE_CASES = [b"", b"a", b"aa", b"aaaaaaaaaa", b"abababababab", bytes(range(256))]
+
+
+def mixed_data(size: int) -> bytes:
+    rng = np.random.default_rng(3)
+    return rng.integers(0, 8, size, dtype=np.uint8).tobytes()
+
+
+@pytest.mark.parametrize("data", EDGE_CASES)
+def test_lz78_round_trip(data):
+    assert lz78_decode(lz78_encode(data)) == data
+
+
+@pytest.mark.parametrize("data", EDGE_CASES)
+@pytest.mark.parametrize("policy", list(LZW_POLICIES))
+def test_lzw_round_trip(data, policy):
+    assert lzw_decode(lzw_encode(data, policy=policy)) == data
+
+
+@pytest.mark.parametrize("policy", list(LZW_POLICIES))
+@pytest.mark.parametrize("max_code_bits", [9, 10])
+def test_lzw_full_dictionary(policy, max_code_bits, text_data):
+    # Словарь из 2 ** max_code_bits фраз заполняется много раз: проверяется политика
+    for data in (mixed_data(30000), text_data[:30000]):
+        encoded = lzw_encode(data, max_code_bits, policy)
+        assert encoded[:2] == bytes([max_code_bits, LZW_POLICIES[policy]])
+        assert lzw_decode(encoded) == data
+
+
+def test_lzw_policies_differ_on_full_dictionary(text_data):
+    data = text_data[:30000]
+    sizes = {policy: len(lzw_encode(data, 9, policy)) for policy in LZW_POLICIES}
+    assert len(set(sizes.values())) == len(sizes)
+
+
+@pytest.mark.parametrize("mode", list(LZ78_MODES))
+def test_compress_modes(mode, text_data):
+    for data in (b"", b"a", text_data):
+        compressed = lz78_compress(data, mode)
+        assert compressed[0] == LZ78_MODES[mode]
+        assert lz78_decompress(compressed) == data
+
+
+def test_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        lzw_encode(b"abc", policy="fifo")
+    with pytest.raises(ValueError):
+        lzw_encode(b"abc", max_code_bits=8)
+
+
+def test_rejects_broken_stream():
+    with pytest.raises(ValueError):
+        lzw_decode(b"\x10")
+    with pytest.raises(ValueError):
+        lzw_decode(bytes([16, len(LZW_POLICIES)]))
+    with pytest.raises(ValueError):
+        lz78_decompress(b"\x07")
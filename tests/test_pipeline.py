@@ -0,0 +1,69 @@
+import pytest
+
+from compressors import pipeline
+from compressors.pipeline import PIPELINES, STAGES, Pipeline, Stage, create_stage, register_stage
+from conftest import read_sample
+
+EDGE_CASES = [b"", b"a", b"aaaaaaaa", b"abracadabra" * 50]
+
+
+@pytest.mark.parametrize("name", list(PIPELINES))
+def test_named_pipelines_round_trip(name, text_data):
+    chain = Pipeline(name)
+    for data in EDGE_CASES + [text_data[:30000]]:
+        assert chain.decode(chain.encode(data)) == data
+
+
+def test_named_pipelines_are_distinct():
+    # Каждый сценарий - своя цепочка стадий, а не псевдоним другого
+    chains = [Pipeline(name).name for name in PIPELINES]
+    assert len(set(chains)) == len(chains)
+    assert Pipeline("BWT+RLE+MTF+HA").name == "bwt+rle7+mtf+zrle+huffman"
+
+
+@pytest.mark.parametrize("spec", ["prefilter+rle", "prefilter+bwt+mtf+zrle+huffman", "bwt+mtf+zrle+rle7",
+                                  "bwt+mtf+zrle+lz77+huffman", "lz78+lz77", "mtf+huffman"])
+def test_custom_chains_round_trip(spec):
+    chain = Pipeline(spec)
+    assert chain.name == spec
+    for data in EDGE_CASES + [read_sample("gray_image.raw")[:20009]]:
+        assert chain.decode(chain.encode(data)) == data
+
+
+def test_stage_parameters(text_data):
+    chain = Pipeline([("bwt", {"block_size": 5000, "chunk_size": 2000, "samples": 31}), "mtf", "zrle",
+                      ("huffman", {"max_code_length": 9}), ("lz77", {"level": "fast", "block_size": 3000})])
+    data = text_data[:20000]
+    assert chain.decode(chain.encode(data)) == data
+
+
+@pytest.mark.parametrize("file_name", ["gray_image.raw", "color_image.raw", "bw_image.raw"])
+def test_image_pipeline_with_prefilter(file_name):
+    data = read_sample(file_name)
+    chain = Pipeline("prefilter+lz77+huffman")
+    assert chain.decode(chain.encode(data)) == data
+
+
+@pytest.mark.parametrize("spec", ["FOO", "bwt+foo", [], [("bwt", {"samples": 1})], [("lz77", {"level": "ultra"})]])
+def test_rejects_bad_specs(spec):
+    with pytest.raises(ValueError):
+        Pipeline(spec)
+
+
+def test_register_stage(monkeypatch):
+    monkeypatch.setattr(pipeline, "STAGES", dict(STAGES))
+
+    class XorStage(Stage):
+        name = "xor"
+
+        def encode(self, buffer: memoryview) -> bytes:
+            return bytes(byte ^ 0x55 for byte in buffer)
+
+        decode = encode
+
+    register_stage(XorStage)
+    assert isinstance(create_stage("xor"), XorStage)
+    chain = Pipeline("xor+huffman")
+    assert chain.decode(chain.encode(b"abcabc")) == b"abcabc"
+    with pytest.raises(ValueError):
+        register_stage(XorStage)
@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from compressors.rle import (RLE7_MAX_COUNT, RLE_MAX_COUNT, RLE_MODES, bit_rle_compress, bit_rle_decompress,
+                             improved_rle_compress, improved_rle_decompress, rle7_compress, rle7_decompress,
+                             rle_compress, rle_decompress)
+from conftest import read_sample
+
+EDGE_CASES = [b"", b"a", b"aa", b"ab", b"aaab", b"abbb"]
+
+
+# Серии длиннее наибольшей длины токена и длинные неповторяющиеся последовательности
+def run_data() -> bytes:
+    rng = np.random.default_rng(5)
+    return (b"a" * 1000 + bytes(range(256)) * 2 + b"b" * (RLE7_MAX_COUNT + 1) + b"cd" * 300
+            + rng.integers(0, 3, 5000, dtype=np.uint8).tobytes() + b"e" * (RLE_MAX_COUNT + 1))
+
+
+# Построчный кодер формата rle7 из сценария BWT+RLE: векторный кодер должен давать тот же код
+def reference_rle7(data: bytes) -> bytes:
+    compressed = bytearray()
+    i = 0
+    n = len(data)
+    while i < n:
+        current = data[i]
+        count = 1
+        while i + count < n and count < RLE7_MAX_COUNT and data[i + count] == current:
+            count += 1
+        if count > 1:
+            compressed.append(0x80 | count)
+            compressed.append(current)
+            i += count
+        else:
+            seq = bytearray()
+            seq.append(current)
+            i += 1
+            while i < n and len(seq) < RLE7_MAX_COUNT and (i >= n - 1 or data[i] != data[i + 1]):
+                seq.append(data[i])
+                i += 1
+            compressed.append(len(seq))
+            compressed.extend(seq)
+    return bytes(compressed)
+
+
+@pytest.mark.parametrize("data", EDGE_CASES + [run_data()])
+def test_rle7_round_trip(data):
+    compressed = rle7_compress(data)
+    assert compressed == reference_rle7(data)
+    assert rle7_decompress(compressed) == data
+
+
+@pytest.mark.parametrize("data", EDGE_CASES + [run_data()])
+def test_improved_rle_round_trip(data):
+    assert improved_rle_decompress(improved_rle_compress(data)) == data
+
+
+def test_round_trip_text(text_data):
+    assert rle7_decompress(rle7_compress(text_data)) == text_data
+    assert improved_rle_decompress(improved_rle_compress(text_data)) == text_data
+
+
+@pytest.mark.parametrize("compressed", [b"\x85", b"\x05abc", b"\x03ab"])
+def test_rle7_truncated_token(compressed):
+    with pytest.raises(ValueError, match="токен обрывается"):
+        rle7_decompress(compressed)
+
+
+@pytest.mark.parametrize("compressed", [b"\x05", b"\x00\x05abc"])
+def test_improved_rle_truncated_token(compressed):
+    with pytest.raises(ValueError):
+        improved_rle_decompress(compressed)
+
+
+def bw_image(width: int, height: int, pixels: np.ndarray) -> bytes:
+    return f"bw,{width},{height}\n".encode("ascii") + pixels.astype(np.uint8).tobytes()
+
+
+def bw_cases() -> list[bytes]:
+    rng = np.random.default_rng(6)
+    # Строки из одних единиц, строки, начинающиеся с единиц, ширина не кратна 8,
+    # шум (строки хранятся упакованными битами) и одноцветное изображение
+    stripes = np.zeros((20, 13), dtype=np.uint8)
+    stripes[::3] = 255
+    stripes[1::3, :5] = 255
+    noise = rng.integers(0, 2, (16, 37)) * 255
+    return [bw_image(1, 1, np.array([255])), bw_image(13, 20, stripes), bw_image(37, 16, noise),
+            bw_image(9, 4, np.full(36, 7)), read_sample("bw_image.raw")]
+
+
+@pytest.mark.parametrize("data", bw_cases())
+def test_bit_rle_round_trip(data):
+    compressed = bit_rle_compress(data)
+    assert compressed is not None
+    assert bit_rle_decompress(compressed) == data
+    assert rle_compress(data)[0] == RLE_MODES["bits"]
+    assert rle_decompress(rle_compress(data)) == data
+
+
+def test_bit_rle_only_for_two_colors():
+    assert bit_rle_compress(b"") is None
+    assert bit_rle_compress(b"abc") is None
+    assert bit_rle_compress(read_sample("gray_image.raw")) is None
+    assert bit_rle_compress(bw_image(3, 1, np.array([0, 1, 2]))) is None
+    with pytest.raises(ValueError):
+        rle_compress(b"abc", "bits")
+
+
+@pytest.mark.parametrize("data", [b"", b"a", run_data()])
+@pytest.mark.parametrize("mode", ["auto", "bytes"])
+def test_rle_modes_round_trip(data, mode):
+    compressed = rle_compress(data, mode)
+    assert compressed[0] == RLE_MODES["bytes"]
+    assert rle_decompress(compressed) == data
+
+
+def test_bit_rle_broken_stream():
+    compressed = bit_rle_compress(bw_cases()[1])
+    with pytest.raises(ValueError):
+        bit_rle_decompress(compressed[:-1])